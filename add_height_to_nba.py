@@ -1,31 +1,48 @@
 import pandas as pd
 
-# Load NBA complete assisted data
-nba_df = pd.read_csv('temp_data/nba_complete_assisted.csv')
+from entity_resolution import load_crosswalk, resolve_keys
 
-# Load NBA combine data
-combine_df = pd.read_csv('temp_data/nba_combine_data_clean.csv')
 
-# Clean player names for matching
-nba_df['player_match'] = nba_df['Player'].str.lower().str.strip()
-combine_df['player_match'] = combine_df['PLAYER_NAME'].str.lower().str.strip()
+def add_height(nba_df, combine_df, crosswalk=None):
+    """NBA careers with a combine Height column (replacing any Height from an earlier run)."""
+    # Re-running on an already merged file would otherwise add Height_x / Height_y
+    nba_df = nba_df.drop(columns=[c for c in ('Height', 'Height_x', 'Height_y')
+                                  if c in nba_df.columns])
 
-# Get height data (using HEIGHT_WO_SHOES as it's more consistent)
-height_data = combine_df[['player_match',
-                          'HEIGHT_WO_SHOES']].drop_duplicates('player_match')
+    # Clean player names for matching (combine spellings resolved via the crosswalk)
+    nba_df['player_match'] = nba_df['Player'].str.lower().str.strip()
+    combine_df = combine_df.assign(
+        player_match=resolve_keys(combine_df['PLAYER_NAME'], 'combine', crosswalk))
 
-# Merge height data
-nba_df = nba_df.merge(height_data, on='player_match', how='left')
-nba_df.rename(columns={'HEIGHT_WO_SHOES': 'Height'}, inplace=True)
+    # Get height data (using HEIGHT_WO_SHOES as it's more consistent)
+    height_data = combine_df[['player_match',
+                              'HEIGHT_WO_SHOES']].drop_duplicates('player_match')
 
-# Drop the temporary matching column
-nba_df.drop(columns=['player_match'], inplace=True)
+    # Merge height data
+    nba_df = nba_df.merge(height_data, on='player_match', how='left')
+    nba_df.rename(columns={'HEIGHT_WO_SHOES': 'Height'}, inplace=True)
 
-print(f"Total NBA players: {len(nba_df)}")
-print(f"Players with height data: {nba_df['Height'].notna().sum()}")
-print(f"\nSample players with height:")
-print(nba_df[nba_df['Height'].notna()][['Player', 'Height']].head(10))
+    # Drop the temporary matching column
+    return nba_df.drop(columns=['player_match'])
 
-# Save updated file
-nba_df.to_csv('temp_data/nba_complete_assisted.csv', index=False)
-print("\nSaved updated nba_complete_assisted.csv with Height column")
+
+def main(input_file='temp_data/nba_complete_assisted.csv',
+         output_file='temp_data/nba_complete_assisted.csv'):
+    # Load NBA complete assisted data and NBA combine data
+    nba_df = pd.read_csv(input_file)
+    combine_df = pd.read_csv('temp_data/nba_combine_data_clean.csv')
+
+    nba_df = add_height(nba_df, combine_df, load_crosswalk())
+
+    print(f"Total NBA players: {len(nba_df)}")
+    print(f"Players with height data: {nba_df['Height'].notna().sum()}")
+    print(f"\nSample players with height:")
+    print(nba_df[nba_df['Height'].notna()][['Player', 'Height']].head(10))
+
+    # Save updated file
+    nba_df.to_csv(output_file, index=False)
+    print(f"\nSaved {output_file} with Height column")
+
+
+if __name__ == "__main__":
+    main()
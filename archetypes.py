@@ -0,0 +1,162 @@
+# ============================================================
+# archetypes.py — Offline Shot-Profile Archetype Clusters
+# ============================================================
+# Players are clustered with MiniBatchKMeans on their standardized shot diet
+# (zone frequencies) and assisted% profile. The fit uses every D-I player with
+# enough attempts (falls back to NBA + 2026 players when all_assisted.csv is
+# absent). Every player then gets an archetype label and distance to centroid.
+#
+# The table is stored as a small .npz tagged with the data fingerprint, so
+# the app only reads it: tab 1 filters by archetype and tab 3 lists a
+# player's archetype peers.
+#
+# Build offline with `python archetypes.py`.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_arrays, save_arrays
+from similarity import WEIGHT_GROUPS
+
+PATH_ARCHETYPES = Path(__file__).parent / "temp_data" / "player_archetypes.npz"
+# Bump when the clustering setup changes so older tables are rebuilt
+ARCHETYPE_FORMAT = "1"
+
+ARCHETYPE_METRICS = WEIGHT_GROUPS["Shot frequency"] + WEIGHT_GROUPS["Assisted%"]
+N_ARCHETYPES = 8
+# Only players with at least this many attempts shape the centroids
+FIT_MIN_ATTEMPTS = 100
+
+ZONE_NAMES = {"Rim_Freq": "Rim", "Mid_Freq": "Midrange", "Three_Freq": "Perimeter"}
+
+
+def _features(frame: pd.DataFrame) -> np.ndarray:
+    return frame[ARCHETYPE_METRICS].apply(pd.to_numeric, errors="coerce").to_numpy(
+        dtype=float, na_value=np.nan)
+
+
+def _describe(centroid_z: np.ndarray) -> str:
+    """Readable name from a standardized centroid (dominant zone + shot creation)."""
+    z = dict(zip(ARCHETYPE_METRICS, centroid_z))
+    zone = max(ZONE_NAMES, key=lambda m: z[m])
+    assisted = z["Total_Assisted%"]
+    creation = ("play finisher" if assisted > 0.5
+                else "self-creator" if assisted < -0.5 else "balanced creator")
+    return f"{ZONE_NAMES[zone]}-heavy {creation}"
+
+
+class ArchetypeTable:
+    """Archetype label and distance to centroid per player (keyed by player_lower)."""
+
+    def __init__(self, player_lower: np.ndarray, players: np.ndarray,
+                 cluster: np.ndarray, distance: np.ndarray, labels: np.ndarray):
+        self.labels = [str(label) for label in labels]
+        self.frame = pd.DataFrame({
+            "Player": players,
+            "Archetype": pd.Categorical.from_codes(cluster, self.labels),
+            "Archetype_Distance": distance,
+        }, index=pd.Index(player_lower, name="player_lower"))
+        self.frame = self.frame[~self.frame.index.duplicated()]
+        self._cluster = self.frame["Archetype"].cat.codes
+        # Members of each archetype, most central first
+        self._members = {c: group.sort_values("Archetype_Distance").index.to_numpy()
+                         for c, group in self.frame.groupby(self._cluster)}
+
+    def __contains__(self, player_lower) -> bool:
+        return player_lower in self._cluster.index
+
+    def label_of(self, player_lower):
+        return self.frame.at[player_lower, "Archetype"] if player_lower in self else None
+
+    def labels_for(self, player_lower: pd.Series) -> pd.Series:
+        """Archetype label for each player_lower value (NaN where unassigned)."""
+        return player_lower.map(self.frame["Archetype"]).astype(object)
+
+    def peers(self, player_lower, n: int = 12, candidates=None) -> pd.DataFrame:
+        """The most central other members of the player's archetype.
+
+        ``candidates`` optionally restricts peers to a set of player_lower values.
+        """
+        if player_lower not in self:
+            return self.frame.iloc[:0]
+        members = self._members[self._cluster[player_lower]]
+        members = members[members != player_lower]
+        if candidates is not None:
+            members = members[np.fromiter((m in candidates for m in members), bool, len(members))]
+        return self.frame.loc[members[:n]]
+
+    def save(self, path: Path = PATH_ARCHETYPES, fingerprint: str = ""):
+        """Write the table to ``path`` (atomically replaced)."""
+        save_arrays(path, fingerprint, ARCHETYPE_FORMAT,
+                    player_lower=self.frame.index.to_numpy(dtype=str),
+                    players=self.frame["Player"].to_numpy(dtype=str),
+                    cluster=self.frame["Archetype"].cat.codes.to_numpy(np.int16),
+                    distance=self.frame["Archetype_Distance"].to_numpy(np.float32),
+                    labels=np.array(self.labels))
+
+    @classmethod
+    def open(cls, path: Path = PATH_ARCHETYPES, fingerprint: str = None):
+        """Load the table, or return None if it is missing or built from other data."""
+        arrays = load_arrays(path, fingerprint, ARCHETYPE_FORMAT)
+        if arrays is None:
+            return None
+        return cls(arrays["player_lower"].astype(object), arrays["players"].astype(object),
+                   arrays["cluster"], arrays["distance"], arrays["labels"])
+
+
+def build_archetype_table(data, n_archetypes: int = N_ARCHETYPES) -> ArchetypeTable:
+    """Fit archetypes on the college population and assign every college / NBA / 2026 player."""
+    from sklearn.cluster import MiniBatchKMeans
+
+    frames = [d.frame for d in (data.all_college, data.combined) if d is not None]
+    players = pd.concat([f[["player_lower", "Player", "Total_Att"] + ARCHETYPE_METRICS]
+                         for f in frames], ignore_index=True)
+    players = players.drop_duplicates("player_lower", keep="first")
+
+    raw = _features(players)
+    present = np.isfinite(raw)
+    attempts = pd.to_numeric(players["Total_Att"], errors="coerce").fillna(0).to_numpy()
+    fit_rows = present.all(axis=1) & (attempts >= FIT_MIN_ATTEMPTS)
+    if fit_rows.sum() < n_archetypes:
+        fit_rows = present.all(axis=1)
+
+    mean = raw[fit_rows].mean(axis=0)
+    std = raw[fit_rows].std(axis=0)
+    std[std == 0] = 1.0
+    # Missing features sit at the fit mean (0 after standardizing)
+    z = np.where(present, (np.where(present, raw, 0.0) - mean) / std, 0.0)
+
+    model = MiniBatchKMeans(n_clusters=n_archetypes, batch_size=2048, n_init=5,
+                            random_state=0).fit(z[fit_rows])
+
+    # Assign players with at least half of the features
+    assign = present.sum(axis=1) >= len(ARCHETYPE_METRICS) / 2
+    dist = model.transform(z[assign])
+    cluster = dist.argmin(axis=1)
+
+    # Number archetypes that share a description
+    names = [_describe(c) for c in model.cluster_centers_]
+    labels = [f"{name} ({names[:i + 1].count(name)})" if names.count(name) > 1 else name
+              for i, name in enumerate(names)]
+
+    assigned = players[assign]
+    return ArchetypeTable(assigned["player_lower"].to_numpy(), assigned["Player"].to_numpy(),
+                          cluster.astype(np.int16), dist.min(axis=1).astype(np.float32),
+                          np.array(labels))
+
+
+def main():
+    from dataset import data_fingerprint, load_datasets
+
+    print("Loading datasets...")
+    data = load_datasets()
+    table = build_archetype_table(data)
+    table.save(PATH_ARCHETYPES, data_fingerprint())
+    print(f"✅ Saved archetypes for {len(table.frame):,} players to {PATH_ARCHETYPES}")
+    print(table.frame["Archetype"].value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# ============================================================
+# artifacts.py — Fingerprinted .npz Snapshot Tables
+# ============================================================
+# Offline stages (neighbour lists, archetypes, player map) store numpy arrays
+# next to the source data, tagged with the data fingerprint and a per-table
+# format string. Readers get None for missing, stale or unreadable files.
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+def save_arrays(path: Path, fingerprint: str, fmt: str, **arrays):
+    """Write ``arrays`` to a compressed .npz at ``path`` (atomically replaced)."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez_compressed(tmp, fingerprint=fingerprint, format=fmt, **arrays)
+    tmp.replace(path)
+
+
+def load_arrays(path: Path, fingerprint: str = None, fmt: str = None):
+    """Arrays stored at ``path`` as a dict, or None if missing or built from other data."""
+    if not Path(path).exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            if (fmt is not None and str(npz["format"]) != fmt) or (
+                    fingerprint is not None and str(npz["fingerprint"]) != fingerprint):
+                return None
+            return {key: npz[key] for key in npz.files}
+    except (OSError, KeyError, ValueError):
+        return None  # unreadable / partial file
+
+
+def open_or_build(cls, path: Path, fingerprint: str, build):
+    """``cls.open(path, fingerprint)``, or ``build()`` (saved best-effort) when that is None."""
+    table = cls.open(path, fingerprint)
+    if table is None:
+        table = build()
+        try:
+            table.save(path, fingerprint)
+        except OSError:
+            pass  # e.g. read-only filesystem — keep the in-memory table
+    return table
@@ -0,0 +1,310 @@
+# ============================================================
+# dataset.py — Data Loading + Read-only Dataset Handles
+# ============================================================
+
+import hashlib
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from entity_resolution import PATH_CROSSWALK, load_crosswalk, resolve_keys
+from player_index import PlayerIndex
+from utils import compute_metrics
+
+# Dataset.frame hands out shallow copies; copy-on-write guarantees writes to
+# them never reach the shared cached table (always on from pandas 3.0).
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# ============================================================
+# PATHS
+# ============================================================
+ROOT = Path(__file__).parent
+PATH_ASSISTED = ROOT / "temp_data" / "nba_complete_assisted.csv"
+PATH_NBA_PLAYERS = ROOT / "temp_data" / "nba_players.csv"
+PATH_CAREER = ROOT / "temp_data" / "career_drafted.csv"
+PATH_BART = ROOT / "temp_data" / "Bart_Core_Positions.csv"
+PATH_ALL_ASSISTED = ROOT / "temp_data" / "all_assisted.csv"
+PATH_2026_STATS = ROOT / "temp_data" / "2026_stats.csv"
+PATH_2026_CURRENT = ROOT / "temp_data" / "2026_current_players.csv"
+# Per-season play-by-play arrays (the season table is built from these)
+PATHS_PBP = tuple(sorted((ROOT / "temp_data").glob("*_pbp_playerstat_array.json")))
+
+SOURCE_PATHS = (PATH_ASSISTED, PATH_NBA_PLAYERS, PATH_CAREER, PATH_BART,
+                PATH_ALL_ASSISTED, PATH_2026_STATS, PATH_2026_CURRENT, PATH_CROSSWALK) + PATHS_PBP
+
+
+def data_version():
+    """Fingerprint of the source files — cached views rebuild when any of them change."""
+    return tuple((p.name, p.stat().st_mtime_ns) for p in SOURCE_PATHS if p.exists())
+
+
+def data_fingerprint() -> str:
+    """Content hash of the source files — tags offline artifacts built from them."""
+    digest = hashlib.sha256()
+    for p in SOURCE_PATHS:
+        if p.exists():
+            digest.update(p.name.encode())
+            digest.update(p.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+# ============================================================
+# DATASET HANDLE
+# ============================================================
+def _share(obj):
+    """Hand out cached frames as copy-on-write shallow copies, arrays and dicts read-only."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj.copy(deep=False)
+    if isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    elif isinstance(obj, dict):
+        return MappingProxyType(obj)
+    return obj
+
+
+class Dataset:
+    """Read-only handle to one player table plus lazily built, cached derived views.
+
+    Tabs and pages receive handles instead of raw DataFrames. ``frame`` returns a
+    copy-on-write shallow copy, so callers can filter, sort or add columns without
+    touching the shared table and without defensive ``.copy()`` calls.
+    """
+
+    __slots__ = ("name", "version", "_frame", "_nba_players",
+                 "_current_players", "_views", "_lock")
+
+    def __init__(self, name: str, frame: pd.DataFrame, version=(),
+                 nba_players=None, current_players=None):
+        set_ = object.__setattr__
+        set_(self, "name", name)
+        set_(self, "version", version)
+        set_(self, "_frame", frame)
+        set_(self, "_nba_players", nba_players)
+        set_(self, "_current_players", current_players)
+        set_(self, "_views", {})
+        set_(self, "_lock", threading.RLock())
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"Dataset '{self.name}' is read-only")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"Dataset '{self.name}' is read-only")
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    def __repr__(self) -> str:
+        return f"Dataset({self.name!r}, rows={len(self._frame)})"
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._frame.copy(deep=False)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._frame.columns
+
+    def view(self, key, build):
+        """Return derived view ``key``, building it from the table on first use."""
+        with self._lock:
+            if key not in self._views:
+                self._views[key] = build(self.frame)
+            return _share(self._views[key])
+
+    def derive(self, name: str, build) -> "Dataset":
+        """Cached sub-dataset (e.g. a filtered population) with the same membership sets."""
+        return self.view(("derive", name), lambda f: Dataset(
+            f"{self.name}/{name}", build(f), self.version,
+            self._nba_players, self._current_players))
+
+    @property
+    def index(self) -> PlayerIndex:
+        """Name → row lookup, sorted options and NBA / 2026 membership sets."""
+        return self.view("index", lambda f: PlayerIndex(
+            f, self._nba_players, self._current_players))
+
+    def group_means(self, by: str) -> pd.DataFrame:
+        """Mean of every numeric column per ``by`` group (e.g. Role_final, Year_final)."""
+        return self.view(("group_means", by),
+                         lambda f: f.groupby(by).mean(numeric_only=True))
+
+    def column_means(self) -> pd.Series:
+        """Mean of every numeric column over the whole table."""
+        return self.view("column_means", lambda f: f.mean(numeric_only=True))
+
+
+class Datasets(NamedTuple):
+    """Every table the app works with, loaded once per data version."""
+    nba: Dataset                      # NBA careers with merged Role/Year
+    combined: Dataset                 # NBA + 2026 current (compare + similarity)
+    current: Optional[Dataset]        # 2026 current season players
+    all_college: Optional[Dataset]    # every D-I player (all_assisted.csv)
+    non_nba: Optional[Dataset]        # all_college minus NBA players
+    career: Dataset
+    bart: Dataset
+
+
+# ============================================================
+# LOAD
+# ============================================================
+def _with_player_lower(df: pd.DataFrame, source: str = None, crosswalk=None) -> pd.DataFrame:
+    """Add the player_lower join key; names from ``source`` go through the crosswalk."""
+    names = df["Player_lower"] if "Player_lower" in df.columns else df["Player"]
+    df["player_lower"] = resolve_keys(names, source, crosswalk)
+    return df
+
+
+def height_to_inches(height_str):
+    """Convert a "6-5" height string to inches (None if unparseable)."""
+    try:
+        if pd.isna(height_str) or height_str == '':
+            return None
+        parts = str(height_str).split('-')
+        if len(parts) == 2:
+            feet, inches = int(parts[0]), int(parts[1])
+            return feet * 12 + inches
+        return None
+    except:
+        return None
+
+
+def load_datasets(version=None) -> Datasets:
+    """Read and merge every source file into read-only Dataset handles."""
+    version = data_version() if version is None else version
+
+    # Load the complete dataset that already has all metrics calculated
+    df_complete = pd.read_csv(PATH_ASSISTED, low_memory=False)
+    df_nba_players = pd.read_csv(PATH_NBA_PLAYERS, low_memory=False)
+    df_career = pd.read_csv(PATH_CAREER, low_memory=False)
+    df_bart = pd.read_csv(PATH_BART, low_memory=False)
+
+    # Optional files (2026 season + all_assisted may be absent on cloud deployments)
+    df_2026_current = pd.read_csv(PATH_2026_CURRENT, low_memory=False) \
+        if PATH_2026_CURRENT.exists() else None
+    df_2026 = pd.read_csv(PATH_2026_STATS, low_memory=False) \
+        if PATH_2026_STATS.exists() else None
+    df_all_assisted = pd.read_csv(PATH_ALL_ASSISTED, low_memory=False) \
+        if PATH_ALL_ASSISTED.exists() else None
+
+    # Ensure player_lower column exists
+    if "player_lower" not in df_complete.columns:
+        df_complete["player_lower"] = df_complete["Player"].astype(
+            str).str.lower().str.strip()
+
+    # Secondary sources are keyed into the play-by-play names via the crosswalk
+    crosswalk = load_crosswalk()
+    for source, df_temp in (("nba_players", df_nba_players), ("career", df_career),
+                            ("bart", df_bart)):
+        _with_player_lower(df_temp, source, crosswalk)
+
+    # Add player_lower to 2026 stats if available
+    if df_2026 is not None:
+        _with_player_lower(df_2026, "2026_stats", crosswalk)
+
+    # Use complete NBA players data first (includes undrafted), then fallback to drafted-only data
+    df_nba_slim = df_nba_players[["player_lower",
+                                  "Role", "YR"]].drop_duplicates("player_lower")
+    df_career_slim = df_career[["player_lower",
+                                "Role", "YR"]].drop_duplicates("player_lower")
+    df_bart_slim = df_bart[["player_lower", "Role",
+                            "YYR"]].drop_duplicates("player_lower")
+
+    # Add 2026 stats slim version
+    if df_2026 is not None:
+        df_2026_slim = df_2026[["player_lower", "Role",
+                                "YR"]].drop_duplicates("player_lower")
+    else:
+        df_2026_slim = None
+
+    # Merge with priority: 2026_stats > nba_players (all) > career_drafted > bart
+    df = df_complete
+
+    if df_2026_slim is not None:
+        df = df.merge(df_2026_slim, on="player_lower",
+                      how="left", suffixes=("", "_2026"))
+
+    df = df.merge(df_nba_slim, on="player_lower", how="left",
+                  suffixes=("", "_nba") if df_2026_slim is not None else ("", ""))
+    df = df.merge(df_career_slim, on="player_lower",
+                  how="left", suffixes=("", "_career"))
+    df = df.merge(df_bart_slim, on="player_lower",
+                  how="left", suffixes=("", "_bart"))
+
+    # Create final role and year with priority order: 2026 > nba > career > bart
+    if df_2026_slim is not None:
+        df["Role_final"] = df.get("Role", df.get("Role_2026")).fillna(
+            df.get("Role_nba", df.get("Role"))).fillna(
+            df.get("Role_career")).fillna(df.get("Role_bart"))
+        df["Year_final"] = df.get("YR", df.get("YR_2026")).fillna(
+            df.get("YR_nba", df.get("YR")))
+    else:
+        df["Role_final"] = df["Role"].fillna(
+            df["Role_career"]).fillna(df["Role_bart"])
+        df["Year_final"] = df["YR"].fillna(df["YYR"])
+
+    # Process all_assisted data (non-NBA players) if available
+    df_all_computed = None
+    if df_all_assisted is not None:
+        if "Player_lower" in df_all_assisted.columns or "player_lower" not in df_all_assisted.columns:
+            _with_player_lower(df_all_assisted)
+        df_all_computed = compute_metrics(df_all_assisted, df_career, df_bart)
+
+    # Add dunk metrics to NBA dataset (df) as well
+    if "DunkMade" in df.columns and "DunkMiss" in df.columns:
+        df["DunkAtt"] = df["DunkMade"] + df["DunkMiss"]
+        df["Total_Att"] = df.get("RimAtt", 0) + \
+            df.get("Mid_Att", 0) + df.get("Three_Att", 0)
+        df["Dunk_Freq"] = df["DunkAtt"].div(
+            df["Total_Att"].replace({0: pd.NA}))
+        df["Dunk_FG%"] = df["DunkMade"].div(df["DunkAtt"].replace({0: pd.NA}))
+
+    # Process 2026 current players if available
+    if df_2026_current is not None and len(df_2026_current) > 0:
+        if "player_lower" not in df_2026_current.columns:
+            df_2026_current["player_lower"] = df_2026_current["Player"].astype(
+                str).str.lower().str.strip()
+        df_2026_current["Role_final"] = df_2026_current["Role"]
+        df_2026_current["Year_final"] = df_2026_current["YR"]
+
+        # Convert Height from "6-5" format to inches
+        if "Height" in df_2026_current.columns:
+            df_2026_current['Height'] = df_2026_current['Height'].apply(
+                height_to_inches)
+
+        # Combined dataset for comparison/similarity (NBA + 2026 current),
+        # keeping the NBA version if a player is in both
+        df_combined = pd.concat([df, df_2026_current], ignore_index=True)
+        df_combined = df_combined.drop_duplicates(
+            subset=['player_lower'], keep='first')
+    else:
+        df_combined = df
+        df_2026_current = None  # Ensure it's explicitly None if empty
+
+    nba_players = df["Player"].dropna().unique()
+    current_players = df_2026_current["Player"].dropna().unique() \
+        if df_2026_current is not None else None
+
+    def handle(name, frame):
+        return Dataset(name, frame, version, nba_players, current_players)
+
+    non_nba = None
+    if df_all_computed is not None:
+        # Players in all_assisted but not in nba_complete
+        nba_players_lower = set(df["player_lower"].str.lower().str.strip())
+        non_nba = handle("non_nba", df_all_computed[~df_all_computed["player_lower"].str.lower(
+        ).str.strip().isin(nba_players_lower)])
+
+    return Datasets(
+        nba=handle("nba", df),
+        combined=handle("combined", df_combined),
+        current=handle("current", df_2026_current) if df_2026_current is not None else None,
+        all_college=handle("all_college", df_all_computed) if df_all_computed is not None else None,
+        non_nba=non_nba,
+        career=handle("career", df_career),
+        bart=handle("bart", df_bart),
+    )
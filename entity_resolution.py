@@ -0,0 +1,241 @@
+# ============================================================
+# entity_resolution.py — Cross-Source Player Name Crosswalk
+# ============================================================
+# The play-by-play JSON arrays are the reference player list; every other
+# source (nba_players, career_drafted, Bart positions, 2026 stats, combine
+# measurements) spells names its own way ("A.J." vs "AJ", "Jr." suffixes,
+# accents). Each source name is resolved to a reference player_lower:
+#
+#   exact       lowercased names match (what the joins did before)
+#   normalized  names match after stripping accents, punctuation, suffixes
+#               and joining initials
+#   fuzzy       best difflib ratio within the candidate's blocks, above
+#               MATCH_THRESHOLD and clear of the runner-up
+#
+# Fuzzy candidates come only from shared blocks — same phonetic surname key +
+# first initial, or same team (and season, when the source has one) — so
+# scoring stays far below all pairs. Sources with a season (the combine's
+# draft year) only match players whose last college season is close to it,
+# which keeps pre-2010 draftees from borrowing a namesake's stats. The result
+# is persisted as a crosswalk CSV that dataset loading and the data scripts
+# apply before joining.
+#
+# Build offline with `python entity_resolution.py`.
+
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent
+PATH_CROSSWALK = ROOT / "temp_data" / "player_crosswalk.csv"
+
+MATCH_THRESHOLD = 0.88
+# Fuzzy matches must beat the second-best candidate by this much
+MATCH_MARGIN = 0.03
+# A source season S accepts players whose last college season is in [S - 2, S]
+SEASON_WINDOW = 2
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Source name → (csv path, name column, team column, season column or fixed season)
+SOURCES = {
+    "nba_players": (ROOT / "temp_data" / "nba_players.csv", "Player", "Team", None),
+    "career": (ROOT / "temp_data" / "career_drafted.csv", "Player", "Team", None),
+    "bart": (ROOT / "temp_data" / "Bart_Core_Positions.csv", "Player", "Team", None),
+    "2026_stats": (ROOT / "temp_data" / "2026_stats.csv", "Player", "Team", 2026),
+    "combine": (ROOT / "temp_data" / "nba_combine_data_clean.csv", "PLAYER_NAME", None, "SEASON"),
+}
+
+
+def lower_key(names: pd.Series) -> pd.Series:
+    """The exact join key used across source files (lowercased, stripped)."""
+    return names.astype(str).str.lower().str.strip()
+
+
+def normalize_name(name) -> str:
+    """Accent-, punctuation- and suffix-free name with initials joined ("A. J. Núñez Jr." → "aj nunez")."""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    text = re.sub(r"[.'`’]", "", text.lower())
+    tokens = [t for t in re.split(r"[\s\-,]+", text) if t and t not in NAME_SUFFIXES]
+    joined = []
+    for token in tokens:
+        if len(token) == 1 and joined and len(joined[-1]) == 1:
+            joined[-1] += token  # "a j" → "aj"
+        else:
+            joined.append(token)
+    return " ".join(joined)
+
+
+_SOUNDEX = {c: str(d) for d, letters in enumerate(
+    ["aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"]) for c in letters}
+
+
+def soundex(word: str) -> str:
+    """American Soundex code ("robert" → "r163")."""
+    word = re.sub(r"[^a-z]", "", word.lower())
+    if not word:
+        return ""
+    code, last = word[0], _SOUNDEX.get(word[0], "")
+    for c in word[1:]:
+        digit = _SOUNDEX.get(c, "")
+        if digit != "0" and digit != last:
+            code += digit
+        if c not in "hw":
+            last = digit
+    return (code + "000")[:4]
+
+
+def _missing(value) -> bool:
+    return value is None or pd.isna(value)
+
+
+def blocking_keys(norm: str, team=None, season=None) -> list:
+    """Blocks a normalized name falls in: phonetic surname + initial, and team(/season)."""
+    tokens = norm.split()
+    keys = [f"p:{soundex(tokens[-1])}{tokens[0][0]}"] if tokens else []
+    if not _missing(team):
+        keys.append(f"t:{str(team).lower().strip()}:{'' if _missing(season) else int(season)}")
+    return keys
+
+
+# ============================================================
+# REFERENCE PLAYERS
+# ============================================================
+def reference_players(folder: Path = ROOT / "temp_data", json_files=None) -> pd.DataFrame:
+    """Every (Player, Team, Season) in the play-by-play arrays (``json_files`` or all in ``folder``)."""
+    rows = []
+    if json_files is None:
+        json_files = sorted(folder.glob("*_pbp_playerstat_array.json"))
+    for path in json_files:
+        season = int(path.name.split("_")[0])
+        with open(path) as f:
+            rows.extend((r[1], r[2], season) for r in json.load(f) if len(r) > 2)
+    ref = pd.DataFrame(rows, columns=["Player", "Team", "Season"])
+    ref = ref.dropna(subset=["Player"])
+    ref["player_lower"] = lower_key(ref["Player"])
+    return ref
+
+
+class Resolver:
+    """Blocked index over the reference players for one-to-one source matching."""
+
+    def __init__(self, reference: pd.DataFrame):
+        self.keys = set(reference["player_lower"])
+        self.norm = {key: normalize_name(key) for key in self.keys}
+        self.by_norm = defaultdict(set)
+        for key, norm in self.norm.items():
+            self.by_norm[norm].add(key)
+        self.last_season = reference.groupby("player_lower")["Season"].max().to_dict()
+        # Team blocks exist per season and season-less, for sources without seasons
+        self.blocks = defaultdict(set)
+        for key, team, season in reference[["player_lower", "Team", "Season"]].itertuples(
+                index=False):
+            for block in {*blocking_keys(self.norm[key], team, season),
+                          *blocking_keys(self.norm[key], team)}:
+                self.blocks[block].add(key)
+
+    def _in_window(self, key, season) -> bool:
+        return _missing(season) or season - SEASON_WINDOW <= self.last_season[key] <= season
+
+    def resolve(self, source: pd.DataFrame) -> pd.DataFrame:
+        """Crosswalk rows (source_lower, player_lower, method, score) for a source.
+
+        ``source`` has Player plus optional Team / Season columns. Exact matches
+        are claimed first; each reference player is matched at most once.
+        """
+        source = source.assign(source_lower=lower_key(source["Player"]))
+        source = source.drop_duplicates("source_lower")
+        rows, claimed = [], set()
+
+        exact = source["source_lower"].isin(self.keys)
+        for key in source.loc[exact, "source_lower"]:
+            rows.append((key, key, "exact", 1.0))
+            claimed.add(key)
+
+        pending = []
+        for rec in source[~exact].itertuples(index=False):
+            norm = normalize_name(rec.source_lower)
+            if not norm:
+                continue
+            season = getattr(rec, "Season", None)
+            matches = {key for key in self.by_norm.get(norm, set()) - claimed
+                       if self._in_window(key, season)}
+            if len(matches) == 1:
+                key = matches.pop()
+                rows.append((rec.source_lower, key, "normalized", 1.0))
+                claimed.add(key)
+            else:
+                pending.append((rec, norm, season))
+
+        # Score only within shared blocks, then match greedily best-first
+        scored = []
+        for rec, norm, season in pending:
+            candidates = set()
+            for block in blocking_keys(norm, getattr(rec, "Team", None), season):
+                candidates |= self.blocks.get(block, set())
+            ranked = sorted(((SequenceMatcher(None, norm, self.norm[key]).ratio(), key)
+                             for key in candidates - claimed
+                             if self._in_window(key, season)), reverse=True)
+            if not ranked or ranked[0][0] < MATCH_THRESHOLD:
+                continue
+            if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < MATCH_MARGIN:
+                continue  # ambiguous
+            scored.append((ranked[0][0], rec.source_lower, ranked[0][1]))
+        for score, source_lower, key in sorted(scored, reverse=True):
+            if key not in claimed:
+                rows.append((source_lower, key, "fuzzy", round(score, 3)))
+                claimed.add(key)
+
+        return pd.DataFrame(rows, columns=["source_lower", "player_lower", "method", "score"])
+
+
+def build_crosswalk(sources=SOURCES, json_files=None) -> pd.DataFrame:
+    """Resolve every available source against the play-by-play reference players."""
+    resolver = Resolver(reference_players(json_files=json_files))
+    frames = []
+    for name, (path, name_col, team_col, season_col) in sources.items():
+        if not path.exists():
+            continue
+        cols = [c for c in (name_col, team_col, season_col) if isinstance(c, str)]
+        df = pd.read_csv(path, usecols=cols, low_memory=False).rename(
+            columns={name_col: "Player", team_col: "Team", season_col: "Season"})
+        if isinstance(season_col, int):
+            df["Season"] = season_col
+        df = df.dropna(subset=["Player"])
+        frames.append(resolver.resolve(df).assign(source=name))
+    return pd.concat(frames, ignore_index=True)[
+        ["source", "source_lower", "player_lower", "method", "score"]]
+
+
+# ============================================================
+# APPLY
+# ============================================================
+def load_crosswalk(path: Path = PATH_CROSSWALK):
+    """Crosswalk table, or None when it has not been built (joins stay exact)."""
+    return pd.read_csv(path) if Path(path).exists() else None
+
+
+def resolve_keys(names: pd.Series, source: str, crosswalk=None) -> pd.Series:
+    """player_lower join keys for a source's names, mapped through the crosswalk."""
+    keys = lower_key(names)
+    if crosswalk is None:
+        return keys
+    rows = crosswalk[(crosswalk["source"] == source) & (crosswalk["method"] != "exact")]
+    return keys.map(dict(zip(rows["source_lower"], rows["player_lower"]))).fillna(keys)
+
+
+def main():
+    print("Resolving player names across sources...")
+    crosswalk = build_crosswalk()
+    crosswalk.to_csv(PATH_CROSSWALK, index=False)
+    print(f"✅ Saved {len(crosswalk):,} crosswalk rows to {PATH_CROSSWALK}")
+    print(crosswalk.groupby(["source", "method"]).size().unstack(fill_value=0).to_string())
+
+
+if __name__ == "__main__":
+    main()
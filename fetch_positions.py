@@ -1,95 +1,151 @@
 """
 Fetch player position data from Sports Reference College Basketball
 """
+import argparse
+import asyncio
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import time
 
-# We'll fetch multiple years to get comprehensive data
-years = range(2010, 2026)
-all_players = []
+from http_cache import HttpCache
+from scraper import Fetcher, FetchError, Politeness
 
-for year in years:
-    url = f"https://www.sports-reference.com/cbb/seasons/men/{year}-leaders.html"
-    print(f"Fetching {year} data from Sports Reference...")
+BASE_URL = "https://www.sports-reference.com/cbb/seasons/men"
+# We'll fetch multiple years to get comprehensive data
+YEARS = range(2010, 2026)
+POSITION_COLUMNS = ('pos', 'position', 'role', 'class')
+OUTPUT_FILE = 'temp_data/sports_reference_positions.csv'
+
+
+def season_page(year):
+    return f"{year}-leaders.html"
+
+
+def extract_players(html, year):
+    """Player / Pos cells of every table with a Player column, read straight from the HTML."""
+    from lxml import html as lxml_html
+
+    rows = []
+    for table in lxml_html.fromstring(html).iter('table'):
+        header_rows = table.xpath('./thead/tr') or table.xpath('.//tr')[:1]
+        if not header_rows:
+            continue
+        headers = [cell.text_content().strip() for cell in header_rows[-1].xpath('./th|./td')]
+        if 'Player' not in headers:
+            continue
+        player_idx = headers.index('Player')
+        pos_idx = next((i for i, h in enumerate(headers) if h.lower() in POSITION_COLUMNS), None)
+        body_rows = table.xpath('./tbody/tr') or table.xpath('.//tr')[1:]
+        for tr in body_rows:
+            if 'thead' in (tr.get('class') or ''):
+                continue  # repeated header rows inside long tables
+            cells = tr.xpath('./th|./td')
+            if len(cells) <= max(player_idx, pos_idx or 0):
+                continue
+            pos = cells[pos_idx].text_content().strip() if pos_idx is not None else None
+            rows.append((cells[player_idx].text_content().strip(), pos, year))
+    return pd.DataFrame(rows, columns=['Player', 'Pos', 'Year'])
+
+
+def standardize_roles(roles: pd.Series) -> pd.Series:
+    """Vectorized G / F / C standardization (None where missing or unrecognized)."""
+    role = roles.astype(str).str.strip().str.upper()
+    has = lambda s: role.str.contains(s, regex=False)
+    missing = roles.isna() | role.isin(['', 'NULL', 'NAN', 'NONE'])
+    conditions = [
+        missing,
+        # Guard: PG, G, Wing G, Combo G, SG, etc.
+        has('PG') | has('SG') | (has('G') & ~has('F')),
+        # Forward: PF, SF, Wing F, Stretch 4, F
+        has('PF') | has('SF') | has('WING F') | has('STRETCH') | (role == 'F'),
+        # Center: C
+        role == 'C',
+    ]
+    choices = np.array([None, 'G', 'F', 'C'], dtype=object)
+    return pd.Series(np.select(conditions, choices, default=None), index=roles.index, dtype=object)
+
+
+async def fetch_seasons(years, politeness=None, base_url=BASE_URL, cache=None, html_dir=None):
+    """Player tables for every season, fetched concurrently (or read from saved pages)."""
+    fetcher = None if html_dir else Fetcher(politeness, cache)
+
+    async def season(year):
+        try:
+            if html_dir:
+                html = (Path(html_dir) / season_page(year)).read_bytes()
+            else:
+                response = await fetcher.get(f"{base_url}/{season_page(year)}")
+                if response.status != 200:
+                    raise FetchError(f"HTTP {response.status}")
+                html = response.body
+            players = await asyncio.to_thread(extract_players, html, year)
+            print(f"  Found {len(players)} players from {year}")
+            return players
+        except (FetchError, OSError, ValueError) as e:
+            print(f"  Error fetching {year}: {e}")
+            return None
 
     try:
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-        response.raise_for_status()
-
-        # Use pandas to read HTML tables
-        tables = pd.read_html(response.content)
-
-        for table in tables:
-            if 'Player' in table.columns or 'Rk' in table.columns:
-                # Add year column
-                if 'Player' in table.columns:
-                    table['Year'] = year
-                    all_players.append(table)
-                    print(f"  Found {len(table)} players from {year}")
-
-        time.sleep(1)  # Be nice to the server
-
-    except Exception as e:
-        print(f"  Error fetching {year}: {e}")
-        continue
-
-if not all_players:
-    print("No data found! Trying alternative approach...")
-    exit(1)
-
-# Combine all data
-df = pd.concat(all_players, ignore_index=True)
-
-# Clean up player names
-if 'Player' in df.columns:
+        tables = await asyncio.gather(*(season(year) for year in years))
+    finally:
+        if fetcher is not None:
+            fetcher.close()
+    return [t for t in tables if t is not None and len(t)]
+
+
+def parse_args():
+    defaults = Politeness()
+    parser = argparse.ArgumentParser(description="Fetch positions from Sports Reference season pages.")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--html-dir", default=None,
+                        help="read saved {year}-leaders.html pages from here instead of fetching")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--rate", type=float, default=defaults.rate,
+                        help="requests per second per host (0 = unlimited)")
+    parser.add_argument("--no-cache", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    politeness = Politeness(concurrency=args.concurrency, rate=args.rate)
+    cache = None if args.no_cache or args.html_dir else HttpCache()
+
+    print(f"Fetching {len(YEARS)} seasons from {args.html_dir or args.base_url}...")
+    all_players = asyncio.run(fetch_seasons(YEARS, politeness, args.base_url, cache, args.html_dir))
+
+    if not all_players:
+        print("No data found! Trying alternative approach...")
+        exit(1)
+
+    # Combine all data
+    df = pd.concat(all_players, ignore_index=True)
+
+    # Clean up player names
     df['player_lower'] = df['Player'].str.lower().str.strip()
 
-print(f"\nTotal records: {len(df)}")
-print(
-    f"Unique players: {df['player_lower'].nunique() if 'player_lower' in df.columns else 'N/A'}")
-
-# Look for position column
-pos_col = None
-for col in df.columns:
-    if col.lower() in ['pos', 'position', 'role', 'class']:
-        pos_col = col
-        print(f"Found position column: {col}")
-        break
-
-if pos_col:
-    # Standardize positions
-    def standardize_role(role):
-        if pd.isna(role) or role == '' or str(role).lower() in ['null', 'nan', 'none']:
-            return None
-        role = str(role).strip().upper()
+    print(f"\nTotal records: {len(df)}")
+    print(f"Unique players: {df['player_lower'].nunique()}")
 
-        # Guard: PG, G, Wing G, Combo G, SG, etc.
-        if 'PG' in role or 'SG' in role or ('G' in role and 'F' not in role):
-            return 'G'
-        # Forward: PF, SF, Wing F, Stretch 4, F
-        elif 'PF' in role or 'SF' in role or 'WING F' in role or 'STRETCH' in role or (role == 'F'):
-            return 'F'
-        # Center: C
-        elif role == 'C':
-            return 'C'
-        else:
-            return None
+    if df['Pos'].notna().any():
+        df['Role'] = standardize_roles(df['Pos'])
+        df = df[df['Role'].notna()]
+
+        print(f"\nRole distribution:")
+        print(df['Role'].value_counts())
 
-    df['Role'] = df[pos_col].apply(standardize_role)
-    df = df[df['Role'].notna()]
+        # Keep unique players with their role
+        df = df[['Player', 'player_lower', 'Role']
+                ].drop_duplicates(subset='player_lower')
 
-    print(f"\nRole distribution:")
-    print(df['Role'].value_counts())
+        print(f"\nUnique players with roles: {len(df)}")
 
-    # Keep unique players with their role
-    df = df[['Player', 'player_lower', 'Role']
-            ].drop_duplicates(subset='player_lower')
+    # Save
+    df.to_csv(args.output, index=False)
+    print(f"\n✅ Saved to {args.output}")
 
-    print(f"\nUnique players with roles: {len(df)}")
 
-# Save
-output_file = 'temp_data/sports_reference_positions.csv'
-df.to_csv(output_file, index=False)
-print(f"\n✅ Saved to {output_file}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# ============================================================
+# http_cache.py — On-Disk HTTP Response Cache for the Scrapers
+# ============================================================
+# Final responses (200s and negative results such as 404) are kept in a small
+# SQLite file: one row per URL with status, validators (ETag / Last-Modified)
+# and the sha256 of its body, and bodies stored once per hash, zlib-compressed.
+#
+# Fresh entries are served without touching the network. Stale entries with a
+# validator are revalidated with a conditional GET, so an unchanged page costs
+# a 304 instead of a full download.
+
+import hashlib
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+PATH_HTTP_CACHE = Path(__file__).parent / "temp_data" / "http_cache.sqlite"
+# Entries older than this are revalidated (or refetched when they have no validator)
+MAX_AGE_DAYS = 30
+# Statuses worth remembering; anything else is fetched again next time
+CACHEABLE_STATUS = {200, 404, 410}
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status: int
+    body: bytes
+    etag: str
+    last_modified: str
+    fetched_at: float
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """URL → (status, validators, body) store. Use from a single thread."""
+
+    def __init__(self, path: Path = PATH_HTTP_CACHE, max_age_days: float = MAX_AGE_DAYS):
+        self.max_age = max_age_days * 86400
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, status INTEGER,"
+                " body_hash TEXT, etag TEXT, last_modified TEXT, fetched_at REAL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS bodies (hash TEXT PRIMARY KEY, body BLOB)")
+
+    def get(self, url: str):
+        """Cached entry for ``url`` (None if never stored)."""
+        row = self._conn.execute(
+            "SELECT r.status, b.body, r.etag, r.last_modified, r.fetched_at"
+            " FROM responses r LEFT JOIN bodies b ON b.hash = r.body_hash"
+            " WHERE r.url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        status, blob, etag, last_modified, fetched_at = row
+        body = zlib.decompress(blob) if blob is not None else b""
+        return CacheEntry(url, status, body, etag, last_modified, fetched_at)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.max_age
+
+    def put(self, url: str, status: int, body: bytes, headers) -> bool:
+        """Store a response if its status is cacheable; returns whether it was stored."""
+        if status not in CACHEABLE_STATUS:
+            return False
+        body_hash = hashlib.sha256(body).hexdigest()
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO bodies VALUES (?, ?)",
+                               (body_hash, zlib.compress(body, 6)))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, status, body_hash, headers.get("ETag"),
+                 headers.get("Last-Modified"), time.time()))
+        return True
+
+    def touch(self, url: str):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        with self._conn:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE url = ?",
+                               (time.time(), url))
+
+    def close(self):
+        self._conn.close()
@@ -1,71 +1,78 @@
+import numpy as np
 import pandas as pd
 
-print("Loading files...")
-df_all = pd.read_csv('temp_data/all_assisted.csv')
-bart_pos = pd.read_csv('temp_data/Bart_Core_Positions.csv')
+from entity_resolution import load_crosswalk, resolve_keys
 
-print(f"Total players in all_assisted: {len(df_all)}")
-print(f"Players with positions in Bart file: {len(bart_pos)}")
-
-# Add Role_final column if it doesn't exist
-if 'Role_final' not in df_all.columns:
-    df_all['Role_final'] = None
 
 # Standardize positions from Bart data
-
-
-def standardize_position(position):
-    if pd.isna(position):
-        return None
-
-    position = str(position).upper()
-
-    # Guard: PG, SG, G, Wing G, Combo G, etc.
-    if 'G' in position and 'F' not in position:
-        return 'G'
-
-    # Forward: PF, SF, Wing F, Stretch 4, F
-    if any(x in position for x in ['PF', 'SF', 'WING F', 'STRETCH 4']) or position == 'F':
-        return 'F'
-
-    # Forward-Center combos
-    if 'F-C' in position or 'C-F' in position:
-        return 'F'
-
-    # Center: C
-    if position == 'C':
-        return 'C'
-
-    return None
-
-
-# Standardize Bart positions
-bart_pos['Role_standardized'] = bart_pos['Role'].apply(standardize_position)
-
-# Create lookup with lowercase player names
-bart_pos['player_lower'] = bart_pos['Player'].str.lower().str.strip()
-
-# Merge positions
-print("\nMerging positions...")
-for i, row in df_all.iterrows():
-    player_lower = row['Player_lower']
-
-    # Look up in Bart data
-    match = bart_pos[bart_pos['player_lower'] == player_lower]
-
-    if not match.empty:
-        position = match.iloc[0]['Role_standardized']
-        if position:
-            df_all.at[i, 'Role_final'] = position
-
-# Save results
-print("\nSaving updated all_assisted.csv...")
-df_all.to_csv('temp_data/all_assisted.csv', index=False)
-
-print(f"\nComplete!")
-print(f"Players with positions: {df_all['Role_final'].notna().sum()}")
-print(f"Players without positions: {df_all['Role_final'].isna().sum()}")
-
-# Show breakdown by position
-print(f"\nPosition breakdown:")
-print(df_all['Role_final'].value_counts(dropna=False))
+def standardize_positions(positions: pd.Series) -> pd.Series:
+    """Vectorized G / F / C standardization (None where missing or unrecognized)."""
+    pos = positions.astype(str).str.upper()
+    has = lambda s: pos.str.contains(s, regex=False)
+    conditions = [
+        positions.isna(),
+        # Guard: PG, SG, G, Wing G, Combo G, etc.
+        has('G') & ~has('F'),
+        # Forward: PF, SF, Wing F, Stretch 4, F
+        has('PF') | has('SF') | has('WING F') | has('STRETCH 4') | (pos == 'F'),
+        # Forward-Center combos
+        has('F-C') | has('C-F'),
+        # Center: C
+        pos == 'C',
+    ]
+    choices = [None, 'G', 'F', 'F', 'C']
+    return pd.Series(np.select(conditions, np.array(choices, dtype=object), default=None),
+                     index=positions.index, dtype=object)
+
+
+def merge_positions(df_all, bart_pos, crosswalk=None):
+    """all_assisted rows with Role_final filled from Bart positions where a player matches."""
+    df_all = df_all.copy()
+    # Add Role_final column if it doesn't exist
+    if 'Role_final' not in df_all.columns:
+        df_all['Role_final'] = None
+
+    # Standardize Bart positions
+    bart_pos = bart_pos.assign(Role_standardized=standardize_positions(bart_pos['Role']))
+
+    # Create lookup keyed by player name (crosswalk-resolved; first row per name)
+    bart_pos['player_lower'] = resolve_keys(bart_pos['Player'], 'bart', crosswalk)
+    lookup = (bart_pos.dropna(subset=['player_lower'])
+              .drop_duplicates('player_lower')[['player_lower', 'Role_standardized']]
+              .rename(columns={'player_lower': 'Player_lower'}))
+
+    # Merge positions in one hash join; a found position replaces the old value
+    matched = df_all[['Player_lower']].merge(lookup, on='Player_lower', how='left',
+                                             validate='many_to_one')['Role_standardized']
+    found = matched.notna().to_numpy()
+    df_all['Role_final'] = df_all['Role_final'].astype(object)
+    df_all.loc[found, 'Role_final'] = matched.to_numpy()[found]
+    return df_all
+
+
+def main(input_file='temp_data/all_assisted.csv', output_file='temp_data/all_assisted.csv'):
+    print("Loading files...")
+    df_all = pd.read_csv(input_file)
+    bart_pos = pd.read_csv('temp_data/Bart_Core_Positions.csv')
+
+    print(f"Total players in all_assisted: {len(df_all)}")
+    print(f"Players with positions in Bart file: {len(bart_pos)}")
+
+    print("\nMerging positions...")
+    df_all = merge_positions(df_all, bart_pos, load_crosswalk())
+
+    # Save results
+    print(f"\nSaving updated {output_file}...")
+    df_all.to_csv(output_file, index=False)
+
+    print(f"\nComplete!")
+    print(f"Players with positions: {df_all['Role_final'].notna().sum()}")
+    print(f"Players without positions: {df_all['Role_final'].isna().sum()}")
+
+    # Show breakdown by position
+    print(f"\nPosition breakdown:")
+    print(df_all['Role_final'].value_counts(dropna=False))
+
+
+if __name__ == "__main__":
+    main()
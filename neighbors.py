@@ -0,0 +1,198 @@
+# ============================================================
+# neighbors.py — Offline Top-k Similar Player Lists
+# ============================================================
+# Every player in the similarity set (NBA + 2026 current) gets their top-k most
+# similar players, computed with blocked matrix multiplication so memory stays
+# at one (block × pool) score matrix. Blocks run in parallel on a process pool.
+#
+# The neighbour table (int32 row ids + float16 scores) is stored as a small
+# .npz next to the source data, tagged with the data fingerprint. Tab 3 reads
+# its lists directly; exports can use NeighborTable.to_frame().
+#
+# Build offline with `python neighbors.py`.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_arrays, save_arrays
+from similarity import feature_matrix, masked_cosine
+
+PATH_NEIGHBORS = Path(__file__).parent / "temp_data" / "similar_players.npz"
+# Bump when the table layout changes so older files are rebuilt
+NEIGHBOR_FORMAT = "2"
+NEIGHBOR_K = 50
+BLOCK_ROWS = 512
+
+
+# ============================================================
+# BLOCKED TOP-K
+# ============================================================
+_POOL = None  # per-worker (pool matrix, squared, mask, weights, player names)
+
+
+def _init_pool(matrix, squared, mask, w, names):
+    global _POOL
+    _POOL = (matrix, squared, mask, w, names)
+
+
+def _block_top_k(queries: np.ndarray, query_masks: np.ndarray,
+                 query_names: np.ndarray, k: int):
+    """Top-k pool positions/scores for one block of standardized query rows."""
+    matrix, squared, mask, w, names = _POOL
+    scores = masked_cosine(queries, query_masks, matrix, squared, mask, w)
+    # A player is never their own neighbour (matched by name, as in tab 3)
+    scores[query_names[:, None] == names[None, :]] = -np.inf
+
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    # Best first; ties keep pool order
+    order = np.lexsort((part, -part_scores), axis=1)
+    part = np.take_along_axis(part, order, axis=1)
+    part_scores = np.take_along_axis(part_scores, order, axis=1)
+    # Fewer than k other players in the pool: pad with id -1
+    part[np.isneginf(part_scores)] = -1
+    return part, part_scores
+
+
+def all_pairs_top_k(queries, query_masks, query_names, features, k: int = NEIGHBOR_K,
+                    block_rows: int = BLOCK_ROWS, workers: int = None):
+    """Top-k neighbours in a FeatureMatrix pool for every standardized query row.
+
+    Scores use the NaN-aware ``masked_cosine`` kernel at the default weights.
+    ``workers=0`` runs the blocks in-process; otherwise they are spread over a
+    process pool that receives the pool arrays once per worker.
+    """
+    starts = range(0, len(queries), block_rows)
+    blocks = [(queries[s:s + block_rows], query_masks[s:s + block_rows],
+               query_names[s:s + block_rows], k) for s in starts]
+    if not blocks:
+        return np.empty((0, k), dtype=np.intp), np.empty((0, k), dtype=np.float32)
+
+    pool = (features.matrix, features.matrix ** 2, features.mask,
+            features.default_weights, features.players)
+    workers = min(os.cpu_count() or 1, len(blocks)) if workers is None else workers
+    if workers <= 1:
+        _init_pool(*pool)
+        results = [_block_top_k(*b) for b in blocks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_pool, initargs=pool) as ex:
+            results = list(ex.map(_block_top_k, *zip(*blocks)))
+    return (np.concatenate([r[0] for r in results]),
+            np.concatenate([r[1] for r in results]))
+
+
+# ============================================================
+# NEIGHBOR TABLE
+# ============================================================
+class NeighborTable:
+    """Precomputed top-k lists: ``ids[i]`` are similarity-set rows most similar to row i."""
+
+    def __init__(self, players: np.ndarray, ids: np.ndarray, scores: np.ndarray):
+        self.players = players
+        self.ids = ids
+        self.scores = scores
+        self.positions = {}
+        for pos, name in enumerate(players):
+            self.positions.setdefault(name, pos)
+
+    def __contains__(self, name) -> bool:
+        return name in self.positions
+
+    @property
+    def k(self) -> int:
+        return self.ids.shape[1]
+
+    def neighbors(self, name, k: int = None):
+        """(row ids, scores) of ``name``'s k most similar players, best first."""
+        pos = self.positions[name]
+        ids, scores = self.ids[pos, :k], self.scores[pos, :k]
+        valid = ids >= 0
+        return ids[valid], scores[valid].astype(np.float32)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table (Player, Rank, Similar_Player, Similarity) for exports and reports."""
+        valid = self.ids >= 0
+        rows, ranks = np.nonzero(valid)
+        return pd.DataFrame({
+            "Player": self.players[rows],
+            "Rank": ranks + 1,
+            "Similar_Player": self.players[self.ids[valid]],
+            "Similarity": self.scores[valid].astype(np.float32),
+        })
+
+    def save(self, path: Path = PATH_NEIGHBORS, fingerprint: str = ""):
+        """Write the table to ``path`` (atomically replaced)."""
+        save_arrays(path, fingerprint, NEIGHBOR_FORMAT, players=self.players.astype(str),
+                    ids=self.ids, scores=self.scores)
+
+    @classmethod
+    def open(cls, path: Path = PATH_NEIGHBORS, fingerprint: str = None):
+        """Load the table, or return None if it is missing or built from other data."""
+        arrays = load_arrays(path, fingerprint, NEIGHBOR_FORMAT)
+        if arrays is None:
+            return None
+        return cls(arrays["players"].astype(object), arrays["ids"], arrays["scores"])
+
+
+def build_neighbor_table(similarity_data, k: int = NEIGHBOR_K,
+                         workers: int = None) -> NeighborTable:
+    """Top-k lists for every row of the similarity Dataset, using the same pools as tab 3.
+
+    2026 current players are matched against NBA players only (core metrics,
+    no Height); everyone else against the full set. Uses the default weights.
+    """
+    index = similarity_data.index
+    full = feature_matrix(similarity_data, nba_only=False)
+    players = full.players
+    n = len(full)
+    ids = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float16)
+
+    is_current = np.fromiter((index.is_current(p) for p in players), bool, n)
+
+    # Everyone else: full pool in the full feature space
+    rows = np.flatnonzero(~is_current)
+    if len(rows) and not full.empty:
+        top, sc = all_pairs_top_k(full.matrix[rows], full.mask[rows], players[rows],
+                                  full, k, workers=workers)
+        ids[rows, :top.shape[1]] = top
+        scores[rows, :sc.shape[1]] = sc
+
+    # 2026 players: NBA pool in its own feature space, mapped back to full-set rows
+    rows = np.flatnonzero(is_current)
+    nba = feature_matrix(similarity_data, nba_only=True)
+    if len(rows) and len(nba) and not nba.empty:
+        frame = similarity_data.frame
+        queries, query_masks = nba.transform(
+            frame.iloc[rows][nba.metrics].to_numpy(dtype=float, na_value=np.nan))
+        top, sc = all_pairs_top_k(queries, query_masks, players[rows],
+                                  nba, k, workers=workers)
+        to_full = frame.index.get_indexer(nba.row_index)
+        ids[rows, :top.shape[1]] = np.where(top >= 0, to_full[top], -1)
+        scores[rows, :sc.shape[1]] = sc
+
+    # Rows that had fewer than k candidates keep id -1
+    scores[ids < 0] = 0
+    return NeighborTable(players, ids, scores)
+
+
+def main():
+    from dataset import data_fingerprint, load_datasets
+    from similarity import build_similarity_frame
+
+    print("Loading datasets...")
+    similarity_data = load_datasets().combined.derive("similarity", build_similarity_frame)
+    print(f"Computing top-{NEIGHBOR_K} similar players for {len(similarity_data):,} players...")
+    table = build_neighbor_table(similarity_data)
+    table.save(PATH_NEIGHBORS, data_fingerprint())
+    print(f"✅ Saved neighbour table to {PATH_NEIGHBORS} "
+          f"({PATH_NEIGHBORS.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
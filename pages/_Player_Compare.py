@@ -2,9 +2,15 @@
 # pages/_Player_Compare.py — Player Profile & Comparison (fixed)
 # ============================================================
 
-from utils import compute_metrics, grouped_player_role_year_overall_chart
+from utils import (compute_metrics, grouped_player_role_year_overall_chart,
+                   grouped_players_zone_chart, render_charts_parallel)
+from dataset import Dataset
+from profiles import (ASSISTED_CHARTS, EFFICIENCY_CHARTS, PCT_METRICS, TOTAL_CHART,
+                      VOLUME_METRICS, build_profile_payload)
 import sys
+from functools import partial
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
@@ -14,352 +20,172 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+MAX_COMPARE = 10
 
-def player_compare_app(df_merged: pd.DataFrame,
-                       df_career: pd.DataFrame,
-                       df_bart: pd.DataFrame,
-                       df_nba: pd.DataFrame = None,
-                       df_2026: pd.DataFrame = None) -> None:
-    # Use the pre-computed and merged dataset directly since it already has all metrics and role/year data
-    df = df_merged.copy()
+# Zone → (efficiency column, assisted column)
+ZONE_PAIRS = [
+    ("Non-dunk Rim", ("NonDunk_Rim%", "NonDunk_Assisted%")),
+    ("Total Rim", ("Total_Rim%", "Total_Assisted_Rim%")),
+    ("Mid", ("Mid_FG%", "Mid_Assisted%")),
+    ("TwoPt", ("TwoPt_FG%", "TwoPt_Assisted%")),
+    ("Three", ("Three_FG%", "Three_Assisted%")),
+]
 
-    # Separate NBA and 2026 players for dropdown filtering
-    if df_nba is not None and df_2026 is not None:
-        try:
-            if len(df_2026) > 0:
-                nba_players = set(df_nba["Player"].dropna().unique())
-                current_2026_players = set(df_2026["Player"].dropna().unique())
-            else:
-                nba_players = set(df["Player"].dropna().unique())
-                current_2026_players = set()
-        except:
-            nba_players = set(df["Player"].dropna().unique())
-            current_2026_players = set()
-    else:
-        # If no 2026 data, all players are considered NBA players
-        nba_players = set(df["Player"].dropna().unique())
-        current_2026_players = set()
+
+def player_compare_app(dataset: Dataset, profile_store=None) -> None:
+    # Read-only handle to the pre-computed, merged dataset (metrics + role/year).
+    # Its cached index carries the NBA / 2026 membership sets for dropdown filtering.
+    player_index = dataset.index
+    current_2026_players = player_index.current_players
+
+    # Role / year / overall averages are cached per dataset version
+    role_means = dataset.group_means("Role_final")
+    year_means = dataset.group_means("Year_final")
+    overall_means = dataset.column_means()
 
     # ========================================================
     # SINGLE PLAYER SECTION
     # ========================================================
     st.subheader("Individual Player Profile")
 
-    player_list = ["(none)"] + sorted(df["Player"].dropna().unique())
+    player_list = ["(none)"] + player_index.options
     player_pick = st.selectbox("Select Player", options=player_list, index=0)
 
     if player_pick == "(none)":
         st.info("Select a player to view their assisted and efficiency breakdowns.")
         return
 
-    prow = df.loc[df["Player"] == player_pick].iloc[0]
-    role = prow.get("Role_final", "—")
-    year = prow.get("Year_final", "—")
+    # Precomputed payload (single key-value lookup); build it live if the
+    # store is missing, stale, or doesn't have this player
+    prow = player_index.row(player_pick)
+    profile = profile_store.get(prow["player_lower"]) if profile_store else None
+    if profile is None:
+        profile = build_profile_payload(
+            prow, role_means, year_means, overall_means)
+
+    role = profile["role"] if profile["role"] is not None else "—"
+    year = profile["year"] if profile["year"] is not None else "—"
 
     st.markdown(f"**{player_pick}**  |  Role: **{role}**  |  Year: **{year}**")
 
+    def chart_builder(title, values):
+        return partial(grouped_player_role_year_overall_chart, title, *values)
+
     c1, c2 = st.columns([2, 1])
     with c1:
         # Display volume first
         st.markdown("##### 📈 Volume")
-        vol_metrics = {
-            "Total Attempts": int(prow.get("Total_Att", 0)),
-            "Rim Attempts": int(prow.get("RimAtt", 0)),
-            "Mid Attempts": int(prow.get("Mid_Att", 0)),
-            "Three Attempts": int(prow.get("Three_Att", 0)),
-        }
-        dfv = pd.DataFrame(list(vol_metrics.items()),
-                           columns=["Metric", "Value"])
-        st.table(dfv)
+        st.table(pd.DataFrame({"Metric": [label for label, _ in VOLUME_METRICS],
+                               "Value": profile["volume"]}))
 
         st.markdown("##### 🎯 Percentages")
-        metrics = {
-            "Non-dunk Rim%": prow.get("NonDunk_Rim%"),
-            "Non-dunk Assisted%": prow.get("NonDunk_Assisted%"),
-            "Total Rim%": prow.get("Total_Rim%"),
-            "Total Assisted Rim%": prow.get("Total_Assisted_Rim%"),
-            "Mid FG%": prow.get("Mid_FG%"),
-            "Mid Assisted%": prow.get("Mid_Assisted%"),
-            "TwoPt FG%": prow.get("TwoPt_FG%"),
-            "TwoPt Assisted%": prow.get("TwoPt_Assisted%"),
-            "Three FG%": prow.get("Three_FG%"),
-            "Three Assisted%": prow.get("Three_Assisted%"),
-            "Total Assisted%": prow.get("Total_Assisted%"),
-        }
-        dfm = pd.DataFrame(list(metrics.items()), columns=["Metric", "Value"])
-        dfm["Value"] = dfm["Value"].apply(
-            lambda x: f"{x:.1%}" if pd.notna(x) else "—")
-        st.table(dfm)
+        st.table(pd.DataFrame({"Metric": [label for label, _ in PCT_METRICS],
+                               "Value": profile["percentages"]}))
 
     with c2:
-        # Calculate averages from the current dataset
-        player_role = prow.get("Role_final")
-        player_year = prow.get("Year_final")
-
-        role_df = df[df["Role_final"] == player_role] if pd.notna(
-            player_role) else pd.DataFrame()
-        year_df = df[df["Year_final"] == player_year] if pd.notna(
-            player_year) else pd.DataFrame()
+        st.pyplot(chart_builder(TOTAL_CHART[0], profile["charts"]["total"])())
 
-        role_avg = role_df["Total_Assisted%"].mean(
-        ) if not role_df.empty else None
-        year_avg = year_df["Total_Assisted%"].mean(
-        ) if not year_df.empty else None
-        overall_avg = df["Total_Assisted%"].mean(
-        ) if "Total_Assisted%" in df.columns else None
-
-        fig_total = grouped_player_role_year_overall_chart(
-            "Total Assisted% — Player vs Role/Year/Overall",
-            prow.get("Total_Assisted%"),
-            role_avg,
-            year_avg,
-            overall_avg,
-        )
-        st.pyplot(fig_total)
-
-    def zone_group_section(title: str, stat_map: dict):
+    def zone_group_section(title: str, charts: list, values: list):
         st.markdown(f"#### {title}")
-        player_role = prow.get("Role_final")
-        player_year = prow.get("Year_final")
-
-        role_df = df[df["Role_final"] == player_role] if pd.notna(
-            player_role) else pd.DataFrame()
-        year_df = df[df["Year_final"] == player_year] if pd.notna(
-            player_year) else pd.DataFrame()
 
+        # Draw all five figures concurrently, then emit them in order
         cols = st.columns(5)
-        for (title, (colname, pval)), area in zip(stat_map.items(), cols):
-            rmean = role_df[colname].mean() if not role_df.empty else None
-            ymean = year_df[colname].mean() if not year_df.empty else None
-            overall_mean = df[colname].mean(
-            ) if colname in df.columns else None
+        pngs = render_charts_parallel(
+            [chart_builder(chart_title, vals) for (chart_title, _), vals in zip(charts, values)])
+        for png, area in zip(pngs, cols):
             with area:
-                fig = grouped_player_role_year_overall_chart(
-                    title, pval, rmean, ymean, overall_mean)
-                st.pyplot(fig)
+                st.image(png, use_container_width=True)
 
     # Assisted% (5 charts)
     zone_group_section(
         "Assisted% by Zone (Player vs Role vs Year vs Overall)",
-        {
-            "Rim (non-dunk) Assisted%": ("NonDunk_Assisted%", prow.get("NonDunk_Assisted%")),
-            "Total Rim Assisted%": ("Total_Assisted_Rim%", prow.get("Total_Assisted_Rim%")),
-            "Mid Assisted%": ("Mid_Assisted%", prow.get("Mid_Assisted%")),
-            "TwoPt Assisted%": ("TwoPt_Assisted%", prow.get("TwoPt_Assisted%")),
-            "Three Assisted%": ("Three_Assisted%", prow.get("Three_Assisted%")),
-        },
+        ASSISTED_CHARTS, profile["charts"]["assisted"],
     )
 
     # Efficiency% (5 charts)
     zone_group_section(
         "Efficiency% by Zone (Player vs Role vs Year vs Overall)",
-        {
-            "Non-dunk Rim%": ("NonDunk_Rim%", prow.get("NonDunk_Rim%")),
-            "Total Rim%": ("Total_Rim%", prow.get("Total_Rim%")),
-            "Mid FG%": ("Mid_FG%", prow.get("Mid_FG%")),
-            "TwoPt FG%": ("TwoPt_FG%", prow.get("TwoPt_FG%")),
-            "Three FG%": ("Three_FG%", prow.get("Three_FG%")),
-        },
+        EFFICIENCY_CHARTS, profile["charts"]["efficiency"],
     )
 
     # ========================================================
-    # PLAYER VS PLAYER COMPARISON — TRUE SIDE-BY-SIDE, DOWNWARD
+    # MULTI-PLAYER COMPARISON — ONE VECTORIZED PASS
     # ========================================================
     st.markdown("---")
-    st.subheader("Compare Two Players (Side-by-Side)")
+    st.subheader("Compare Players (up to 10)")
 
-    col1, col2 = st.columns(2)
+    col1, col2 = st.columns([1, 2])
     with col1:
-        # Player A can be anyone (NBA or 2026)
+        # Anchor player can be anyone (NBA or 2026)
         player_a = st.selectbox(
-            "Select Player A", sorted(df["Player"].dropna().unique()), key="player_a"
+            "Select Player A", player_index.options, key="player_a"
         )
     with col2:
-        # Player B - if Player A is 2026, only show NBA players; otherwise show all
-        if player_a and player_a in current_2026_players:
-            # 2026 player selected, only show NBA players for comparison
-            player_b_options = sorted(
-                [p for p in nba_players if p in df["Player"].values])
-            player_b = st.selectbox(
-                "Select Player B (NBA Players Only)", player_b_options, key="player_b"
-            )
-        else:
-            # NBA player or no selection, show all players
-            player_b = st.selectbox(
-                "Select Player B", sorted(df["Player"].dropna().unique()), key="player_b"
-            )
-
-    if not player_a or not player_b:
-        return
-
-    pa = df.loc[df["Player"] == player_a].iloc[0]
-    pb = df.loc[df["Player"] == player_b].iloc[0]
-
-    # --- LAYOUT: LEFT PLAYER | DIVIDER | RIGHT PLAYER ---
-    left, mid, right = st.columns([1, 0.025, 1])
-
-    # ========================================================
-    # LEFT PLAYER (A)
-    # ========================================================
-    with left:
-        st.markdown(f"### {player_a}")
-        st.markdown(
-            f"**Role:** {pa.get('Role_final','—')}  |  **Year:** {pa.get('Year_final','—')}"
-        )
-        st.markdown(
-            f"**Volume:** {int(pa.get('Total_Att', 0)):,} total attempts ({int(pa.get('RimAtt', 0)):,} rim, {int(pa.get('Mid_Att', 0)):,} mid, {int(pa.get('Three_Att', 0)):,} three)"
+        # If the anchor is a 2026 player, only compare against NBA players
+        nba_only = bool(player_a) and player_a in current_2026_players
+        others = player_index.nba_options if nba_only else player_index.options
+        compare_with = st.multiselect(
+            "Compare with (NBA Players Only)" if nba_only else "Compare with",
+            [p for p in others if p != player_a],
+            max_selections=MAX_COMPARE - 1,
+            key=f"compare_with_{'nba' if nba_only else 'all'}",
         )
 
-        metrics = {
-            "Non-dunk Rim%": pa.get("NonDunk_Rim%"),
-            "Non-dunk Assisted%": pa.get("NonDunk_Assisted%"),
-            "Total Rim%": pa.get("Total_Rim%"),
-            "Total Assisted Rim%": pa.get("Total_Assisted_Rim%"),
-            "Mid FG%": pa.get("Mid_FG%"),
-            "Mid Assisted%": pa.get("Mid_Assisted%"),
-            "TwoPt FG%": pa.get("TwoPt_FG%"),
-            "TwoPt Assisted%": pa.get("TwoPt_Assisted%"),
-            "Three FG%": pa.get("Three_FG%"),
-            "Three Assisted%": pa.get("Three_Assisted%"),
-            "Total Assisted%": pa.get("Total_Assisted%"),
-        }
-        dfm_a = pd.DataFrame(list(metrics.items()),
-                             columns=["Metric", "Value"])
-        dfm_a["Value"] = dfm_a["Value"].apply(
-            lambda x: f"{x:.1%}" if pd.notna(x) else "—")
-        st.table(dfm_a)
-
-        # Pairs of efficiency | assisted charts
-        def chart_pairs_a(pairs):
-            for (eff_label, eff_col), (ast_label, ast_col) in pairs:
-                st.markdown(
-                    f"#### {eff_label.replace(' FG%', '')} vs {ast_label.replace('%', '')}")
-                cols = st.columns(2)
-
-                # Efficiency chart
-                with cols[0]:
-                    rmean = df[df["Role_final"] ==
-                               pa["Role_final"]][eff_col].mean()
-                    ymean = df[df["Year_final"] ==
-                               pa["Year_final"]][eff_col].mean()
-                    omean = df[eff_col].mean()
-                    fig = grouped_player_role_year_overall_chart(
-                        eff_label, pa.get(eff_col), rmean, ymean, omean
-                    )
-                    for patch in fig.axes[0].patches:
-                        patch.set_color("#A16EFF")  # purple
-                    st.pyplot(fig)
-
-                # Assisted chart
-                with cols[1]:
-                    rmean = df[df["Role_final"] ==
-                               pa["Role_final"]][ast_col].mean()
-                    ymean = df[df["Year_final"] ==
-                               pa["Year_final"]][ast_col].mean()
-                    omean = df[ast_col].mean()
-                    fig = grouped_player_role_year_overall_chart(
-                        ast_label, pa.get(ast_col), rmean, ymean, omean
-                    )
-                    for patch in fig.axes[0].patches:
-                        patch.set_color("#FF4DD2")  # hot pink
-                    st.pyplot(fig)
-
-                st.markdown("<hr style='border: 0.5px solid #333;'>",
-                            unsafe_allow_html=True)
-
-        chart_pairs_a([
-            (("Non-dunk Rim%", "NonDunk_Rim%"),
-             ("Non-dunk Assisted%", "NonDunk_Assisted%")),
-            (("Total Rim%", "Total_Rim%"),
-             ("Total Rim Assisted%", "Total_Assisted_Rim%")),
-            (("Mid FG%", "Mid_FG%"), ("Mid Assisted%", "Mid_Assisted%")),
-            (("TwoPt FG%", "TwoPt_FG%"), ("TwoPt Assisted%", "TwoPt_Assisted%")),
-            (("Three FG%", "Three_FG%"), ("Three Assisted%", "Three_Assisted%")),
-        ])
-
-    # ========================================================
-    # CENTER DIVIDER
-    # ========================================================
-    with mid:
-        st.markdown(
-            "<div style='border-left: 1px solid #555; height: 100%; margin: 0 auto;'></div>",
-            unsafe_allow_html=True,
-        )
-
-    # ========================================================
-    # RIGHT PLAYER (B)
-    # ========================================================
-    with right:
-        st.markdown(f"### {player_b}")
-        st.markdown(
-            f"**Role:** {pb.get('Role_final','—')}  |  **Year:** {pb.get('Year_final','—')}"
-        )
-        st.markdown(
-            f"**Volume:** {int(pb.get('Total_Att', 0)):,} total attempts ({int(pb.get('RimAtt', 0)):,} rim, {int(pb.get('Mid_Att', 0)):,} mid, {int(pb.get('Three_Att', 0)):,} three)"
-        )
-
-        metrics = {
-            "Non-dunk Rim%": pb.get("NonDunk_Rim%"),
-            "Non-dunk Assisted%": pb.get("NonDunk_Assisted%"),
-            "Total Rim%": pb.get("Total_Rim%"),
-            "Total Assisted Rim%": pb.get("Total_Assisted_Rim%"),
-            "Mid FG%": pb.get("Mid_FG%"),
-            "Mid Assisted%": pb.get("Mid_Assisted%"),
-            "TwoPt FG%": pb.get("TwoPt_FG%"),
-            "TwoPt Assisted%": pb.get("TwoPt_Assisted%"),
-            "Three FG%": pb.get("Three_FG%"),
-            "Three Assisted%": pb.get("Three_Assisted%"),
-            "Total Assisted%": pb.get("Total_Assisted%"),
-        }
-        dfm_b = pd.DataFrame(list(metrics.items()),
-                             columns=["Metric", "Value"])
-        dfm_b["Value"] = dfm_b["Value"].apply(
-            lambda x: f"{x:.1%}" if pd.notna(x) else "—")
-        st.table(dfm_b)
-
-        def chart_pairs_b(pairs):
-            for (eff_label, eff_col), (ast_label, ast_col) in pairs:
-                st.markdown(
-                    f"#### {eff_label.replace(' FG%', '')} vs {ast_label.replace('%', '')}")
-                cols = st.columns(2)
-
-                # Efficiency chart
-                with cols[0]:
-                    rmean = df[df["Role_final"] ==
-                               pb["Role_final"]][eff_col].mean()
-                    ymean = df[df["Year_final"] ==
-                               pb["Year_final"]][eff_col].mean()
-                    omean = df[eff_col].mean()
-                    fig = grouped_player_role_year_overall_chart(
-                        eff_label, pb.get(eff_col), rmean, ymean, omean
-                    )
-                    for patch in fig.axes[0].patches:
-                        patch.set_color("#007CFF")  # blue
-                    st.pyplot(fig)
-
-                # Assisted chart
-                with cols[1]:
-                    rmean = df[df["Role_final"] ==
-                               pb["Role_final"]][ast_col].mean()
-                    ymean = df[df["Year_final"] ==
-                               pb["Year_final"]][ast_col].mean()
-                    omean = df[ast_col].mean()
-                    fig = grouped_player_role_year_overall_chart(
-                        ast_label, pb.get(ast_col), rmean, ymean, omean
-                    )
-                    for patch in fig.axes[0].patches:
-                        patch.set_color("#00FFE0")  # neon teal
-                    st.pyplot(fig)
-
-                st.markdown("<hr style='border: 0.5px solid #333;'>",
-                            unsafe_allow_html=True)
+    names = [player_a] + compare_with if player_a else []
+    if len(names) < 2:
+        st.info("Pick one or more players to compare against Player A.")
+        return
 
-        chart_pairs_b([
-            (("Non-dunk Rim%", "NonDunk_Rim%"),
-             ("Non-dunk Assisted%", "NonDunk_Assisted%")),
-            (("Total Rim%", "Total_Rim%"),
-             ("Total Rim Assisted%", "Total_Assisted_Rim%")),
-            (("Mid FG%", "Mid_FG%"), ("Mid Assisted%", "Mid_Assisted%")),
-            (("TwoPt FG%", "TwoPt_FG%"), ("TwoPt Assisted%", "TwoPt_Assisted%")),
-            (("Three FG%", "Three_FG%"), ("Three Assisted%", "Three_Assisted%")),
-        ])
+    # Single indexed take for every selected row
+    rows = player_index.rows(names)
+    metric_cols = [col for _, col in PCT_METRICS]
+
+    # (players × metrics) matrices: values, role / year averages and deltas
+    values = rows[metric_cols].to_numpy(dtype=float, na_value=np.nan)
+    role_avg = role_means.reindex(rows["Role_final"].to_numpy())[
+        metric_cols].to_numpy(dtype=float, na_value=np.nan)
+    year_avg = year_means.reindex(rows["Year_final"].to_numpy())[
+        metric_cols].to_numpy(dtype=float, na_value=np.nan)
+    overall_avg = overall_means.reindex(metric_cols).to_numpy(dtype=float)
+    deltas = {
+        "Value": values,
+        "Δ vs Role avg": values - role_avg,
+        "Δ vs Year avg": values - year_avg,
+    }
+
+    # --- Context + volume per player ---
+    context = pd.DataFrame({
+        "Player": names,
+        "Role": rows["Role_final"].fillna("—").to_numpy(),
+        "Year": rows["Year_final"].fillna("—").to_numpy(),
+        **{label: rows[col].fillna(0).astype(int).to_numpy()
+           for label, col in VOLUME_METRICS},
+    })
+    st.dataframe(context, use_container_width=True, hide_index=True)
+
+    # --- Metric matrix (metrics down, players across) ---
+    view = st.radio("Show", list(deltas), horizontal=True,
+                    key="compare_matrix_view")
+    matrix = pd.DataFrame(deltas[view].T, columns=names,
+                          index=[label for label, _ in PCT_METRICS])
+    fmt = "{:+.1%}" if view != "Value" else "{:.1%}"
+    st.dataframe(matrix.style.format(fmt, na_rep="—"),
+                 use_container_width=True)
+
+    # --- One grouped chart per zone (efficiency | assisted) ---
+    col_pos = {col: i for i, col in enumerate(metric_cols)}
+    builders = []
+    for zone, (eff_col, ast_col) in ZONE_PAIRS:
+        idx = [col_pos[eff_col], col_pos[ast_col]]
+        builders.append(partial(
+            grouped_players_zone_chart,
+            f"{zone} — Efficiency | Assisted",
+            ["FG%", "Assisted%"], names,
+            values[:, idx], role_avg[:, idx], overall_avg[idx],
+        ))
+
+    st.caption("Bars: player · white tick: player's role average · dashed: overall average")
+    chart_cols = st.columns(2)
+    for i, png in enumerate(render_charts_parallel(builders)):
+        with chart_cols[i % 2]:
+            st.image(png, use_container_width=True)
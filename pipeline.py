@@ -0,0 +1,300 @@
+# ============================================================
+# pipeline.py — Dependency-Tracked Data Build
+# ============================================================
+# Every data-building step is a Stage that names its input files, the
+# outputs of other stages it reads, and the files it writes. A stage's key is
+# a hash of its code and the contents of all its inputs; its outputs live in
+# temp_data/build/<stage>/<key>/, so an unchanged stage is skipped and an
+# upstream rebuild that produces identical files does not cascade.
+#
+# Stages write into a scratch directory that is renamed into place once
+# they succeed, so a failed or interrupted stage never leaves partial
+# artifacts, and no stage ever writes over a file it reads. Independent
+# stages run in parallel worker processes. Finally the app-facing files
+# (nba_complete_assisted.csv, 2026_current_players.csv, all_assisted.csv,
+# player_crosswalk.csv) are published from the artifacts with an atomic
+# replace.
+#
+# Scrapers stay outside the build (they need the network); their position
+# journal is an input, so new scrape results trigger the stages that use them.
+#
+# Run with `python pipeline.py` (see --help for stage selection / --dry-run).
+
+import argparse
+import hashlib
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+DATA = ROOT / "temp_data"
+BUILD_DIR = DATA / "build"
+
+PBP_JSON = tuple(sorted(DATA.glob("*_pbp_playerstat_array.json")))
+
+
+@dataclass(frozen=True)
+class Ref:
+    """Output ``name`` of stage ``stage``."""
+    stage: str
+    name: str
+
+
+@dataclass
+class Stage:
+    name: str
+    run: callable                         # run(inputs: dict, outputs: dict) with Paths
+    inputs: dict                          # role → Path, tuple of Paths or Ref
+    outputs: tuple                        # output file names
+    code: tuple = ()                      # modules whose source is part of the key
+    publish: dict = field(default_factory=dict)   # output name → app path
+
+    def upstream(self) -> set:
+        return {v.stage for v in self.inputs.values() if isinstance(v, Ref)}
+
+
+# ============================================================
+# STAGE FUNCTIONS (module level so worker processes can run them)
+# ============================================================
+def run_crosswalk(inputs, outputs):
+    from entity_resolution import SOURCES, build_crosswalk
+
+    # Input roles are the source names; read the declared files, not the defaults
+    sources = {name: (inputs[name],) + spec[1:] for name, spec in SOURCES.items()}
+    build_crosswalk(sources, inputs["pbp"]).to_csv(outputs["player_crosswalk.csv"], index=False)
+
+
+def run_nba_careers(inputs, outputs):
+    from process_json_data import process_all_json_files
+    process_all_json_files(DATA, inputs["nba_players"], outputs["nba_careers.csv"],
+                           json_files=inputs["pbp"])
+
+
+def run_nba_heights(inputs, outputs):
+    import pandas as pd
+    from add_height_to_nba import add_height
+    from entity_resolution import load_crosswalk
+
+    nba_df = add_height(pd.read_csv(inputs["careers"]), pd.read_csv(inputs["combine"]),
+                        load_crosswalk(inputs["crosswalk"]))
+    nba_df.to_csv(outputs["nba_complete_assisted.csv"], index=False)
+
+
+def run_current_2026(inputs, outputs):
+    from process_current_players import process_current_players
+    process_current_players(2026, DATA, outputs["2026_current_players.csv"], inputs["crosswalk"],
+                            json_file=inputs["json"], stats_file=inputs["stats"])
+
+
+def run_all_careers(inputs, outputs):
+    from process_json_data import process_all_players
+    process_all_players(DATA, outputs["all_careers.csv"], json_files=inputs["pbp"])
+
+
+def run_all_positions(inputs, outputs):
+    import pandas as pd
+    from entity_resolution import load_crosswalk
+    from merge_positions import merge_positions
+
+    df_all = merge_positions(pd.read_csv(inputs["careers"]), pd.read_csv(inputs["bart"]),
+                             load_crosswalk(inputs["crosswalk"]))
+    if inputs["journal"].exists():
+        from scrape_positions import read_journal
+        scraped = df_all["Player"].map(read_journal(inputs["journal"]))
+        df_all["Role_final"] = df_all["Role_final"].fillna(scraped)
+    df_all.to_csv(outputs["all_assisted.csv"], index=False)
+
+
+XW = Ref("crosswalk", "player_crosswalk.csv")
+
+STAGES = [
+    Stage("crosswalk", run_crosswalk,
+          {"pbp": PBP_JSON, "nba_players": DATA / "nba_players.csv",
+           "career": DATA / "career_drafted.csv", "bart": DATA / "Bart_Core_Positions.csv",
+           "2026_stats": DATA / "2026_stats.csv",
+           "combine": DATA / "nba_combine_data_clean.csv"},
+          ("player_crosswalk.csv",), ("entity_resolution.py",),
+          publish={"player_crosswalk.csv": DATA / "player_crosswalk.csv"}),
+    Stage("nba_careers", run_nba_careers,
+          {"pbp": PBP_JSON, "nba_players": DATA / "nba_players.csv"},
+          ("nba_careers.csv",), ("process_json_data.py",)),
+    Stage("nba_heights", run_nba_heights,
+          {"careers": Ref("nba_careers", "nba_careers.csv"),
+           "combine": DATA / "nba_combine_data_clean.csv", "crosswalk": XW},
+          ("nba_complete_assisted.csv",), ("add_height_to_nba.py", "entity_resolution.py"),
+          publish={"nba_complete_assisted.csv": DATA / "nba_complete_assisted.csv"}),
+    Stage("current_2026", run_current_2026,
+          {"stats": DATA / "2026_stats.csv",
+           "json": DATA / "2026_pbp_playerstat_array.json", "crosswalk": XW},
+          ("2026_current_players.csv",),
+          ("process_current_players.py", "process_json_data.py", "entity_resolution.py"),
+          publish={"2026_current_players.csv": DATA / "2026_current_players.csv"}),
+    Stage("all_careers", run_all_careers,
+          {"pbp": PBP_JSON}, ("all_careers.csv",), ("process_json_data.py",)),
+    Stage("all_positions", run_all_positions,
+          {"careers": Ref("all_careers", "all_careers.csv"),
+           "bart": DATA / "Bart_Core_Positions.csv", "crosswalk": XW,
+           "journal": DATA / "scrape_positions.jsonl"},
+          ("all_assisted.csv",),
+          ("merge_positions.py", "entity_resolution.py", "scrape_positions.py"),
+          publish={"all_assisted.csv": DATA / "all_assisted.csv"}),
+]
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+def file_digest(path: Path) -> str:
+    """sha256 of a file ("missing" when absent, so optional inputs still key the stage)."""
+    if not path.exists():
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _paths(value):
+    return value if isinstance(value, tuple) else (value,)
+
+
+class Pipeline:
+    def __init__(self, stages=STAGES, build_dir: Path = BUILD_DIR):
+        self.stages = {s.name: s for s in stages}
+        self.build_dir = Path(build_dir)
+        self._digests = {}
+        self._keys = {}
+
+    def _digest(self, path: Path) -> str:
+        if path not in self._digests:
+            self._digests[path] = file_digest(path)
+        return self._digests[path]
+
+    def resolve(self, stage: Stage) -> dict:
+        """Input role → Path(s), with stage references pointing at their artifacts."""
+        return {role: self.artifact(v.stage, v.name) if isinstance(v, Ref) else v
+                for role, v in stage.inputs.items()}
+
+    def key(self, stage: Stage) -> str:
+        """Hash of the stage's code and input contents (upstream stages must be built)."""
+        if stage.name not in self._keys:
+            digest = hashlib.sha256(stage.name.encode())
+            for module in stage.code:
+                digest.update(self._digest(ROOT / module).encode())
+            for role, value in sorted(self.resolve(stage).items()):
+                digest.update(role.encode())
+                for path in _paths(value):
+                    digest.update(path.name.encode())
+                    digest.update(self._digest(path).encode())
+            self._keys[stage.name] = digest.hexdigest()[:16]
+        return self._keys[stage.name]
+
+    def artifact_dir(self, name: str) -> Path:
+        return self.build_dir / name / self.key(self.stages[name])
+
+    def artifact(self, name: str, output: str) -> Path:
+        return self.artifact_dir(name) / output
+
+    def is_built(self, stage: Stage) -> bool:
+        return all((self.artifact_dir(stage.name) / o).exists() for o in stage.outputs)
+
+    def order(self, targets=None) -> list:
+        """Topologically sorted stage names needed for ``targets`` (all stages by default)."""
+        ordered, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            for dep in sorted(self.stages[name].upstream()):
+                visit(dep)
+            ordered.append(name)
+
+        for name in targets or self.stages:
+            visit(name)
+        return ordered
+
+    def run(self, targets=None, jobs: int = None, force: bool = False, dry_run: bool = False):
+        """Build stale stages, running independent ones in parallel; returns names rebuilt."""
+        pending = self.order(targets)
+        done, rebuilt = set(), []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            running = {}
+            while pending or running:
+                for name in [n for n in pending if self.stages[n].upstream() <= done]:
+                    pending.remove(name)
+                    stage = self.stages[name]
+                    if not force and self.is_built(stage):
+                        print(f"  ✓ {name} (up to date)")
+                        done.add(name)
+                    elif dry_run:
+                        print(f"  • {name} would rebuild")
+                        done.add(name)
+                    else:
+                        print(f"  ▶ {name}")
+                        scratch = self.artifact_dir(name).with_name(
+                            f"{self.key(stage)}.{os.getpid()}.tmp")
+                        shutil.rmtree(scratch, ignore_errors=True)
+                        scratch.mkdir(parents=True)
+                        outputs = {o: scratch / o for o in stage.outputs}
+                        running[pool.submit(stage.run, self.resolve(stage), outputs)] = (
+                            name, scratch)
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, scratch = running.pop(future)
+                    try:
+                        future.result()
+                    except BaseException:
+                        shutil.rmtree(scratch, ignore_errors=True)
+                        raise
+                    final = self.artifact_dir(name)
+                    shutil.rmtree(final, ignore_errors=True)  # --force rebuild
+                    scratch.rename(final)
+                    # Downstream keys are computed from the new artifacts
+                    for path in final.iterdir():
+                        self._digests.pop(path, None)
+                    rebuilt.append(name)
+                    done.add(name)
+                    print(f"  ✅ {name}")
+        if not dry_run:
+            self.publish(targets)
+        return rebuilt
+
+    def publish(self, targets=None):
+        """Copy built outputs to their app paths (atomic replace, only when changed)."""
+        for name in self.order(targets):
+            for output, dest in self.stages[name].publish.items():
+                src = self.artifact(name, output)
+                if dest.exists() and file_digest(dest) == self._digest(src):
+                    continue
+                tmp = dest.with_name(f"{dest.name}.{os.getpid()}.tmp")
+                shutil.copyfile(src, tmp)
+                os.replace(tmp, dest)
+                print(f"  → published {dest.relative_to(ROOT)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the app's data files.")
+    parser.add_argument("stages", nargs="*", help="stages to build (default: all)")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel worker processes")
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only list stale stages")
+    args = parser.parse_args()
+
+    pipeline = Pipeline()
+    unknown = set(args.stages) - set(pipeline.stages)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))} "
+                     f"(choose from {', '.join(pipeline.stages)})")
+    print("Building data pipeline...")
+    rebuilt = pipeline.run(args.stages or None, args.jobs, args.force, args.dry_run)
+    print(f"Done ({len(rebuilt)} stage(s) rebuilt).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# ============================================================
+# player_images.py — Player Image Manifest + Thumbnail Cache
+# ============================================================
+# Headshots live in temp_data/player_images/ as {ID}_{First_Name}_{Last_Name}.png
+# (name parts joined by "_" or "-"). The folder is scanned once into a manifest
+# mapping normalized names and ids to files; cards then embed small, compressed
+# thumbnails whose base64 payloads are kept in a bounded LRU.
+
+import base64
+import re
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+PATH_IMAGES = Path(__file__).parent / "temp_data" / "player_images"
+
+THUMBNAIL_PX = 96          # cards show 45px avatars; 96px stays sharp on 2x screens
+THUMBNAIL_CACHE_SIZE = 512
+
+
+def normalize_name(name: str) -> str:
+    """Matching key for a player name or file name part ("Jaren Jackson Jr." → "jaren_jackson_jr")."""
+    name = str(name).replace(".", "").replace("'", "")
+    return "_".join(re.split(r"[\s_\-]+", name.strip().lower())).strip("_")
+
+
+def images_version(folder: Path = PATH_IMAGES):
+    """Folder mtime — the manifest rebuilds when images are added or removed."""
+    return folder.stat().st_mtime_ns if folder.exists() else None
+
+
+class ImageManifest:
+    """Normalized name / id → image path, built from one directory scan."""
+
+    def __init__(self, folder: Path = PATH_IMAGES):
+        self.by_name = {}
+        self.by_id = {}
+        files = sorted(folder.glob("*.png")) if folder.exists() else []
+        for path in files:
+            player_id, sep, name = path.stem.partition("_")
+            if not sep:
+                continue
+            self.by_id.setdefault(player_id, path)
+            self.by_name.setdefault(normalize_name(name), path)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def path_for(self, player_name):
+        """Image path for ``player_name`` (None if there is no image)."""
+        if not player_name:
+            return None
+        return self.by_name.get(normalize_name(player_name))
+
+    def path_for_id(self, player_id):
+        return self.by_id.get(str(player_id))
+
+
+@lru_cache(maxsize=THUMBNAIL_CACHE_SIZE)
+def _thumbnail(path: str, mtime_ns: int, size: int) -> str:
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.thumbnail((size, size))
+        buf = BytesIO()
+        img.save(buf, format="PNG", optimize=True)
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+def thumbnail_base64(path, size: int = THUMBNAIL_PX):
+    """Base64 PNG thumbnail of an image file, resized and encoded once per file version."""
+    if path is None:
+        return None
+    path = Path(path)
+    try:
+        return _thumbnail(str(path), path.stat().st_mtime_ns, size)
+    except OSError:
+        return None  # missing or unreadable image — card falls back to text
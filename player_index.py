@@ -0,0 +1,57 @@
+# ============================================================
+# player_index.py — Player Lookup Index + Pre-sorted Options
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+
+class PlayerIndex:
+    """Name → row-position lookup, sorted option lists and membership sets for one dataset.
+
+    Built once per dataset version (see ``get_player_index`` in streamlit_app.py)
+    and shared by every selectbox and row lookup, replacing repeated
+    ``sorted(df["Player"].dropna().unique())`` calls and O(n) ``df.loc[df["Player"] == name]`` scans.
+    The indexed frame is kept private; rows are handed out through ``row`` / ``rows``.
+    """
+
+    def __init__(self, df: pd.DataFrame, nba_players=None, current_players=None):
+        self._frame = df
+
+        names = df["Player"]
+        # First occurrence wins, matching df.loc[df["Player"] == name].iloc[0]
+        first = (names.notna() & ~names.duplicated(keep="first")).to_numpy()
+        self.positions = dict(zip(names.to_numpy()[first],
+                                  np.flatnonzero(first).tolist()))
+        self.options = sorted(self.positions)
+
+        # If no NBA list is given, every player counts as an NBA player
+        self.nba_players = frozenset(
+            nba_players if nba_players is not None else self.options)
+        self.current_players = frozenset(
+            current_players if current_players is not None else ())
+        self.nba_options = [p for p in self.options if p in self.nba_players]
+
+    def __contains__(self, name) -> bool:
+        return name in self.positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def position(self, name) -> int:
+        """Row position of ``name`` in the indexed frame (KeyError if missing)."""
+        return self.positions[name]
+
+    def row(self, name) -> pd.Series:
+        """The player's row as a Series, like ``df.loc[df["Player"] == name].iloc[0]``."""
+        return self._frame.iloc[self.positions[name]]
+
+    def rows(self, names) -> pd.DataFrame:
+        """Rows for several players in one indexed take, in the order given."""
+        return self._frame.iloc[[self.positions[n] for n in names]]
+
+    def is_current(self, name) -> bool:
+        return name in self.current_players
+
+    def is_nba(self, name) -> bool:
+        return name in self.nba_players
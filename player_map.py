@@ -0,0 +1,129 @@
+# ============================================================
+# player_map.py — Offline 2D Player Map (PCA Embedding)
+# ============================================================
+# Every player's weighted, standardized similarity features are projected to
+# two dimensions with randomized-solver PCA at build time. Coordinates are
+# stored as a fingerprinted .npz snapshot; the app only colours and draws
+# them (WebGL scatter via pydeck, which ships with streamlit).
+#
+# Build offline with `python player_map.py`.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_arrays, save_arrays
+from similarity import CORE_METRICS, group_weights
+
+PATH_PLAYER_MAP = Path(__file__).parent / "temp_data" / "player_map.npz"
+# Bump when the embedding setup changes so older maps are rebuilt
+MAP_FORMAT = "1"
+
+# Half-width of the drawing area the coordinates are scaled to (pixels at zoom 0)
+MAP_EXTENT = 300.0
+
+PALETTE = [
+    (255, 107, 107), (78, 205, 196), (255, 193, 7), (156, 136, 255),
+    (76, 194, 69), (255, 152, 0), (3, 169, 244), (233, 30, 99),
+    (205, 220, 57), (158, 158, 158),
+]
+
+
+class PlayerMap:
+    """2D map coordinates plus role / dataset labels per player (keyed by player_lower)."""
+
+    def __init__(self, player_lower, players, roles, datasets, xy, explained):
+        self.explained = np.asarray(explained, dtype=float)
+        self.frame = pd.DataFrame({
+            "Player": players,
+            "Role": roles,
+            "Dataset": datasets,
+            "x": xy[:, 0],
+            "y": xy[:, 1],
+        }, index=pd.Index(player_lower, name="player_lower"))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def points(self, color_by: str, archetypes=None) -> pd.DataFrame:
+        """Plot-ready rows with an Archetype column and an RGB ``color`` per ``color_by`` value."""
+        points = self.frame.reset_index()
+        points["Archetype"] = (archetypes.labels_for(points["player_lower"]).fillna("Unassigned")
+                               if archetypes is not None else "Unassigned")
+        categories = sorted(points[color_by].unique())
+        colors = {c: list(PALETTE[i % len(PALETTE)]) for i, c in enumerate(categories)}
+        points["color"] = points[color_by].map(colors)
+        return points
+
+    def save(self, path: Path = PATH_PLAYER_MAP, fingerprint: str = ""):
+        """Write the map to ``path`` (atomically replaced)."""
+        f = self.frame
+        save_arrays(path, fingerprint, MAP_FORMAT,
+                    player_lower=f.index.to_numpy(dtype=str),
+                    players=f["Player"].to_numpy(dtype=str),
+                    roles=f["Role"].to_numpy(dtype=str),
+                    datasets=f["Dataset"].to_numpy(dtype=str),
+                    xy=f[["x", "y"]].to_numpy(np.float32),
+                    explained=self.explained)
+
+    @classmethod
+    def open(cls, path: Path = PATH_PLAYER_MAP, fingerprint: str = None):
+        """Load the map, or return None if it is missing or built from other data."""
+        arrays = load_arrays(path, fingerprint, MAP_FORMAT)
+        if arrays is None:
+            return None
+        return cls(*(arrays[k].astype(object) for k in
+                     ("player_lower", "players", "roles", "datasets")),
+                   arrays["xy"], arrays["explained"])
+
+
+def build_player_map(data) -> PlayerMap:
+    """Randomized PCA of the similarity features for every NBA / 2026 / college player."""
+    from sklearn.decomposition import PCA
+
+    frames = [d.frame for d in (data.combined, data.all_college) if d is not None]
+    players = pd.concat([f[["player_lower", "Player", "Role_final"] + CORE_METRICS]
+                         for f in frames], ignore_index=True)
+    players = players.drop_duplicates("player_lower", keep="first")
+
+    raw = players[CORE_METRICS].apply(pd.to_numeric, errors="coerce").to_numpy(
+        dtype=float, na_value=np.nan)
+    present = np.isfinite(raw)
+    keep = present.sum(axis=1) >= len(CORE_METRICS) / 2
+    players, raw, present = players[keep], raw[keep], present[keep]
+
+    # Standardize (missing → column mean) and apply the default similarity weights
+    mean = np.nanmean(raw, axis=0)
+    std = np.nanstd(raw, axis=0)
+    std[~(std > 0)] = 1.0
+    weights = group_weights()
+    w = np.array([weights.get(m, 1.0) for m in CORE_METRICS])
+    z = np.where(present, (np.where(present, raw, 0.0) - mean) / std, 0.0) * w
+
+    pca = PCA(n_components=2, svd_solver="randomized", random_state=0)
+    xy = pca.fit_transform(z)
+    xy *= MAP_EXTENT / max(np.abs(xy).max(), 1e-9)
+
+    nba = set(data.nba.index.nba_players)
+    current = data.combined.index.current_players
+    names = players["Player"].to_numpy()
+    datasets = np.where([n in current for n in names], "2026",
+                        np.where([n in nba for n in names], "NBA", "College"))
+    roles = players["Role_final"].fillna("Unknown").astype(str).to_numpy()
+    return PlayerMap(players["player_lower"].to_numpy(), names, roles, datasets,
+                     xy.astype(np.float32), pca.explained_variance_ratio_)
+
+
+def main():
+    from dataset import data_fingerprint, load_datasets
+
+    print("Loading datasets...")
+    player_map = build_player_map(load_datasets())
+    player_map.save(PATH_PLAYER_MAP, data_fingerprint())
+    print(f"✅ Saved map coordinates for {len(player_map):,} players to {PATH_PLAYER_MAP} "
+          f"(explained variance {player_map.explained.sum():.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Current-season-style player tables for any season (2010-2026).
+
+For a season, each row of {season}_pbp_playerstat_array.json (one per player
+id and team) is matched to a row of that season's {season}_stats.csv for
+Role / YR / Height: by name and team, or by name alone when the name is
+unique on both sides. Rows matched to the same stats row are summed into one
+player, and rows without a match are dropped, so two different players who
+share a name never get each other's stats row. Seasons without a stats file
+keep every play-by-play row with empty Role / YR / Height.
+
+Run `python process_current_players.py` to backfill every season in parallel,
+or pass seasons (`python process_current_players.py 2024 2025`).
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from entity_resolution import PATH_CROSSWALK, load_crosswalk, resolve_keys
+from process_json_data import STAT_COLS, YEARS, add_shot_metrics, load_pbp_season
+
+DATA_DIR = Path(__file__).parent / "temp_data"
+# Team names in the stats files are cut to 20 characters
+STATS_TEAM_CHARS = 20
+
+
+def season_files(season, data_dir=DATA_DIR):
+    """(pbp json, stats csv, output csv) paths for a season."""
+    data_dir = Path(data_dir)
+    return (data_dir / f"{season}_pbp_playerstat_array.json",
+            data_dir / f"{season}_stats.csv",
+            data_dir / f"{season}_current_players.csv")
+
+
+def _team_key(teams):
+    return teams.astype(str).str.lower().str.strip().str[:STATS_TEAM_CHARS]
+
+
+def match_stats_rows(splits, stats):
+    """Stats row label for each team split (NaN where there is no unambiguous match).
+
+    A split matches the stats row with its name and team. Otherwise it falls back
+    to the stats row with its name, provided the name is unique in both the stats
+    file and the play-by-play and the row was not already matched by team.
+    """
+    stats_keys = pd.DataFrame({'player_lower': stats['player_lower'],
+                               'team_key': _team_key(stats['Team']),
+                               'stats_row': stats.index})
+    by_team = splits[['player_lower']].assign(team_key=_team_key(splits['Team'])).merge(
+        stats_keys.drop_duplicates(['player_lower', 'team_key']),
+        on=['player_lower', 'team_key'], how='left')['stats_row']
+
+    by_team = pd.Series(by_team.to_numpy(), index=splits.index)
+
+    unique_names = stats_keys.drop_duplicates('player_lower', keep=False)
+    unique_names = unique_names[~unique_names['stats_row'].isin(by_team.dropna())]
+    by_name = splits['player_lower'].map(unique_names.set_index('player_lower')['stats_row'])
+    by_name = by_name.where(~splits['player_lower'].duplicated(keep=False))
+    return by_team.fillna(by_name)
+
+
+def process_current_players(season, data_dir=DATA_DIR, output_file=None,
+                            crosswalk_file=PATH_CROSSWALK, verbose=True,
+                            json_file=None, stats_file=None):
+    """Build (and save) the current-players table for one season.
+
+    ``json_file`` / ``stats_file`` override the season's files in ``data_dir``.
+    """
+    default_json, default_stats, default_output = season_files(season, data_dir)
+    json_file = json_file or default_json
+    stats_file = stats_file or default_stats
+    output_file = output_file or default_output
+
+    splits = load_pbp_season(json_file, season)
+    splits['player_lower'] = splits['Player'].str.lower().str.strip()
+    if verbose:
+        print(f"Processing {season} JSON: {len(splits)} team splits")
+
+    if Path(stats_file).exists():
+        # Load season stats for role, year and height info
+        stats = pd.read_csv(stats_file).dropna(subset=['Player']).reset_index(drop=True)
+        stats['player_lower'] = resolve_keys(stats['Player'], f'{season}_stats',
+                                             load_crosswalk(crosswalk_file))
+        splits['stats_row'] = match_stats_rows(splits, stats)
+
+        # Only keep players found in the stats file; splits matched to the
+        # same stats row are one player and are summed
+        agg = {col: 'sum' for col in STAT_COLS}
+        agg.update(player_id='first', Player='first', Team='first')
+        players = (splits.dropna(subset=['stats_row'])
+                   .groupby(['player_lower', 'stats_row'], sort=False).agg(agg).reset_index())
+        players = players[['player_id'] + STAT_COLS + ['Player', 'player_lower', 'Team',
+                                                       'stats_row']]
+        if verbose:
+            print(f"Matched to {Path(stats_file).name}: {len(players)} players")
+
+        rows = players['stats_row'].astype(int).to_numpy()
+        for col in ('Role', 'YR', 'Height'):
+            players[col] = stats[col].to_numpy()[rows] if col in stats.columns else None
+        players = players.drop(columns=['stats_row'])
+    else:
+        players = splits[['player_id'] + STAT_COLS + ['Player', 'player_lower', 'Team']].assign(
+            Role=None, YR=None, Height=None)
+        if verbose:
+            print(f"  No {Path(stats_file).name}; Role / YR / Height left empty")
+
+    players = add_shot_metrics(players)
+
+    # --- Dunk Metrics ---
+    players["DunkAtt"] = players["DunkMade"] + players["DunkMiss"]
+    players["Dunk_Freq"] = players["DunkAtt"] / players["Total_Att"].replace({0: np.nan})
+    players["Dunk_FG%"] = players["DunkMade"] / players["DunkAtt"].replace({0: np.nan})
+
+    # Add season markers
+    players["First_Season"] = season
+    players["Last_Season"] = season
+
+    players.to_csv(output_file, index=False)
+    if verbose:
+        print(f"Saved {season} current players to: {output_file}")
+        print(f"Total players: {len(players)} (with Role/YR: {players['Role'].notna().sum()})")
+    return players
+
+
+def _process_quietly(args):
+    season, data_dir = args
+    return season, len(process_current_players(season, data_dir, verbose=False))
+
+
+def process_seasons(seasons=YEARS, data_dir=DATA_DIR, jobs=None):
+    """Backfill several seasons in parallel; returns {season: player count}."""
+    seasons = [s for s in seasons if season_files(s, data_dir)[0].exists()]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return dict(pool.map(_process_quietly, [(s, data_dir) for s in seasons]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build current-players tables per season.")
+    parser.add_argument("seasons", nargs="*", type=int, help="seasons (default: 2010-2026)")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel worker processes")
+    args = parser.parse_args()
+
+    counts = process_seasons(args.seasons or YEARS, jobs=args.jobs)
+    for season, count in sorted(counts.items()):
+        print(f"  {season}: {count} players → {season_files(season)[2].name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import json
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+YEARS = range(2010, 2027)  # 2010-2026
+
+# Columns of each player row in {year}_pbp_playerstat_array.json (first 15 entries)
+PBP_COLUMNS = ['player_id', 'Player', 'Team',
+               'RimMade', 'RimMiss', 'RimAst', 'MidMade', 'MidMiss', 'MidAst',
+               'ThreeMade', 'ThreeMiss', 'ThreeAst', 'DunkMade', 'DunkMiss', 'DunkAst']
+STAT_COLS = PBP_COLUMNS[3:]
+
+
+def load_pbp_season(json_file, year):
+    """One season's player rows (rows with fewer than 15 entries are skipped)."""
+    with open(json_file, 'r') as f:
+        year_data = json.load(f)
+    rows = [row[:15] for row in year_data if len(row) >= 15]
+    season = pd.DataFrame(rows, columns=PBP_COLUMNS)
+    season.insert(2, 'Year', year)
+    return season
+
+
+def load_pbp_seasons(json_dir="temp_data", years=YEARS, verbose=True, json_files=None):
+    """Player-season rows for every available season (progress printed when ``verbose``).
+
+    ``json_files`` overrides the {year}_pbp_playerstat_array.json files in ``json_dir``.
+    """
+    if json_files is None:
+        json_files = [Path(json_dir) / f"{year}_pbp_playerstat_array.json" for year in years]
+    seasons = []
+    for json_path in map(Path, json_files):
+        year = int(json_path.name.split("_")[0])
+        if not json_path.exists():
+            if verbose:
+                print(f"Warning: {json_path} not found")
+            continue
+        seasons.append(load_pbp_season(json_path, year))
+        if verbose:
+            print(f"Processing {year}: {len(seasons[-1])} players")
+    return pd.concat(seasons, ignore_index=True)
+
+
+def add_shot_metrics(df_final):
+    """Shooting percentages, assisted rates and shot frequencies from the raw counts."""
+    # Convert to numeric to handle any string/null issues
+    for col in STAT_COLS:
+        df_final[col] = pd.to_numeric(df_final[col], errors='coerce').fillna(0)
+
+    # --- Non-dunk rim ---
+    df_final["ND_RimMade"] = (df_final["RimMade"] -
+                              df_final["DunkMade"]).clip(lower=0)
+    df_final["ND_RimMiss"] = (df_final["RimMiss"] -
+                              df_final["DunkMiss"]).clip(lower=0)
+    df_final["ND_RimAtt"] = df_final["ND_RimMade"] + df_final["ND_RimMiss"]
+    df_final["NonDunk_Rim%"] = df_final["ND_RimMade"] / \
+        df_final["ND_RimAtt"].replace({0: np.nan})
+    df_final["NonDunk_Assisted%"] = ((df_final["RimAst"] - df_final["DunkAst"]).clip(lower=0) /
+                                     df_final["ND_RimMade"].replace({0: np.nan}))
+
+    # --- Total rim ---
+    df_final["RimAtt"] = df_final["RimMade"] + df_final["RimMiss"]
+    df_final["Total_Rim%"] = df_final["RimMade"] / \
+        df_final["RimAtt"].replace({0: np.nan})
+    df_final["Total_Assisted_Rim%"] = df_final["RimAst"] / \
+        df_final["RimMade"].replace({0: np.nan})
+
+    # --- Midrange ---
+    df_final["Mid_Att"] = df_final["MidMade"] + df_final["MidMiss"]
+    df_final["Mid_FG%"] = df_final["MidMade"] / \
+        df_final["Mid_Att"].replace({0: np.nan})
+    df_final["Mid_Assisted%"] = df_final["MidAst"] / \
+        df_final["MidMade"].replace({0: np.nan})
+
+    # --- 2pt combined ---
+    df_final["TwoPt_Att"] = df_final["RimMade"] + \
+        df_final["RimMiss"] + df_final["MidMade"] + df_final["MidMiss"]
+    df_final["TwoPt_FG%"] = ((df_final["RimMade"] + df_final["MidMade"]) /
+                             df_final["TwoPt_Att"].replace({0: np.nan}))
+    df_final["TwoPt_Assisted%"] = ((df_final["RimAst"] + df_final["MidAst"]) /
+                                   (df_final["RimMade"] + df_final["MidMade"]).replace({0: np.nan}))
+
+    # --- Three ---
+    df_final["Three_Att"] = df_final["ThreeMade"] + df_final["ThreeMiss"]
+    df_final["Three_FG%"] = df_final["ThreeMade"] / \
+        df_final["Three_Att"].replace({0: np.nan})
+    df_final["Three_Assisted%"] = df_final["ThreeAst"] / \
+        df_final["ThreeMade"].replace({0: np.nan})
+
+    # --- Total Assisted ---
+    df_final["Total_Assisted%"] = ((df_final["RimAst"] + df_final["MidAst"] + df_final["ThreeAst"]) /
+                                   (df_final["RimMade"] + df_final["MidMade"] + df_final["ThreeMade"]).replace({0: np.nan}))
+
+    # --- Shot Frequency Metrics ---
+    df_final["Total_Att"] = df_final["RimAtt"] + \
+        df_final["Mid_Att"] + df_final["Three_Att"]
+    df_final["Rim_Freq"] = df_final["RimAtt"] / \
+        df_final["Total_Att"].replace({0: np.nan})
+    df_final["Mid_Freq"] = df_final["Mid_Att"] / \
+        df_final["Total_Att"].replace({0: np.nan})
+    df_final["Three_Freq"] = df_final["Three_Att"] / \
+        df_final["Total_Att"].replace({0: np.nan})
+    df_final["TwoPt_Freq"] = df_final["TwoPt_Att"] / \
+        df_final["Total_Att"].replace({0: np.nan})
+    return df_final
+
+
+def career_totals(seasons):
+    """Summed counts per player plus First_Season / Last_Season."""
+    totals = seasons.groupby('Player')[STAT_COLS].sum().reset_index()
+    season_ranges = seasons.groupby('Player')['Year'].agg(['min', 'max']).reset_index()
+    season_ranges.columns = ['Player', 'First_Season', 'Last_Season']
+    return totals.merge(season_ranges, on='Player', how='left')
+
+
+def process_all_json_files(json_dir="temp_data", nba_players_path="temp_data/nba_players.csv",
+                           output_file="temp_data/nba_complete_assisted.csv", json_files=None):
+    """Process all JSON files and create comprehensive NBA player dataset with career totals"""
+
+    # Load NBA players for reference
+    nba_players = pd.read_csv(nba_players_path)
+    nba_player_names = set(nba_players['Player'].str.lower().str.strip())
+
+    print(f"NBA players to match: {len(nba_player_names)}")
+
+    seasons = load_pbp_seasons(json_dir, json_files=json_files)
+    seasons = seasons[seasons['Player'].str.lower().str.strip().isin(nba_player_names)]
+
+    print(f"\nTotal player-season records found: {len(seasons)}")
+    if len(seasons) == 0:
+        print("No data found!")
+        return None
+    print(f"Unique players found: {seasons['Player'].nunique()}")
+
+    print("Aggregating career totals...")
+    df_final = career_totals(seasons)
+    print(f"Career totals calculated for {len(df_final)} players")
+
+    print("\nCalculating shooting metrics...")
+    df_final = add_shot_metrics(df_final)
+
+    # Add player_lower column for merging
+    df_final["player_lower"] = df_final["Player"].str.lower().str.strip()
+
+    df_final.to_csv(output_file, index=False)
+    print(f"\nSaved complete dataset to: {output_file}")
+    print(f"Total players: {len(df_final)}")
+    return df_final
+
+
+def process_all_players(json_dir="temp_data", output_file="temp_data/all_assisted.csv",
+                        json_files=None):
+    """Career totals for every D-I player in the play-by-play arrays (all_assisted.csv)."""
+    df_all = career_totals(load_pbp_seasons(json_dir, json_files=json_files))
+    for col in STAT_COLS:
+        df_all[col] = pd.to_numeric(df_all[col], errors='coerce').fillna(0)
+    df_all["Player_lower"] = df_all["Player"].str.lower().str.strip()
+    df_all.to_csv(output_file, index=False)
+    print(f"Saved {len(df_all)} players to: {output_file}")
+    return df_all
+
+
+if __name__ == "__main__":
+    result = process_all_json_files()
@@ -0,0 +1,227 @@
+# ============================================================
+# profiles.py — Precomputed Player Profile Payloads
+# ============================================================
+# Each player's "Individual Player Profile" (volume table, percentage table
+# and the data behind its 11 comparison charts) is built once and stored as
+# compressed JSON in a small SQLite key-value file keyed by player id
+# (player_lower, the join key used across every source file).
+#
+# Build offline with `python profiles.py`; otherwise the app builds the store
+# on a background thread and renders profiles live until it is ready.
+
+import json
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+
+import pandas as pd
+
+PATH_PROFILES = Path(__file__).parent / "temp_data" / "player_profiles.sqlite"
+# Bump when the payload layout changes so older stores are rebuilt
+PROFILE_FORMAT = "1"
+
+VOLUME_METRICS = [
+    ("Total Attempts", "Total_Att"),
+    ("Rim Attempts", "RimAtt"),
+    ("Mid Attempts", "Mid_Att"),
+    ("Three Attempts", "Three_Att"),
+]
+
+PCT_METRICS = [
+    ("Non-dunk Rim%", "NonDunk_Rim%"),
+    ("Non-dunk Assisted%", "NonDunk_Assisted%"),
+    ("Total Rim%", "Total_Rim%"),
+    ("Total Assisted Rim%", "Total_Assisted_Rim%"),
+    ("Mid FG%", "Mid_FG%"),
+    ("Mid Assisted%", "Mid_Assisted%"),
+    ("TwoPt FG%", "TwoPt_FG%"),
+    ("TwoPt Assisted%", "TwoPt_Assisted%"),
+    ("Three FG%", "Three_FG%"),
+    ("Three Assisted%", "Three_Assisted%"),
+    ("Total Assisted%", "Total_Assisted%"),
+]
+
+# Chart title → column, per profile chart section
+TOTAL_CHART = ("Total Assisted% — Player vs Role/Year/Overall", "Total_Assisted%")
+ASSISTED_CHARTS = [
+    ("Rim (non-dunk) Assisted%", "NonDunk_Assisted%"),
+    ("Total Rim Assisted%", "Total_Assisted_Rim%"),
+    ("Mid Assisted%", "Mid_Assisted%"),
+    ("TwoPt Assisted%", "TwoPt_Assisted%"),
+    ("Three Assisted%", "Three_Assisted%"),
+]
+EFFICIENCY_CHARTS = [
+    ("Non-dunk Rim%", "NonDunk_Rim%"),
+    ("Total Rim%", "Total_Rim%"),
+    ("Mid FG%", "Mid_FG%"),
+    ("TwoPt FG%", "TwoPt_FG%"),
+    ("Three FG%", "Three_FG%"),
+]
+
+
+def _clean(val):
+    """JSON-safe scalar (NaN/NA → None, numpy → builtin)."""
+    if val is None or pd.isna(val):
+        return None
+    return val.item() if hasattr(val, "item") else val
+
+
+def _group_mean(means: pd.DataFrame, key, colname):
+    if pd.isna(key) or key not in means.index or colname not in means.columns:
+        return None
+    return _clean(means.at[key, colname])
+
+
+def build_profile_payload(prow: pd.Series, role_means: pd.DataFrame,
+                          year_means: pd.DataFrame, overall_means: pd.Series) -> dict:
+    """Everything the profile section renders for one player, as plain JSON data.
+
+    Labels and chart titles come from the module constants, so only values are stored.
+    """
+    role = prow.get("Role_final")
+    year = prow.get("Year_final")
+
+    def chart(colname):
+        # Player, Role, Year, Overall
+        return [
+            _clean(prow.get(colname)),
+            _group_mean(role_means, role, colname),
+            _group_mean(year_means, year, colname),
+            _clean(overall_means.get(colname)),
+        ]
+
+    pct_vals = (_clean(prow.get(col)) for _, col in PCT_METRICS)
+    return {
+        "role": _clean(role),
+        "year": _clean(year),
+        "volume": [int(_clean(prow.get(col)) or 0) for _, col in VOLUME_METRICS],
+        "percentages": [f"{val:.1%}" if val is not None else "—" for val in pct_vals],
+        "charts": {
+            "total": chart(TOTAL_CHART[1]),
+            "assisted": [chart(col) for _, col in ASSISTED_CHARTS],
+            "efficiency": [chart(col) for _, col in EFFICIENCY_CHARTS],
+        },
+    }
+
+
+def build_dataset_payloads(dataset):
+    """Yield (player id, payload) for every player in a Dataset handle."""
+    role_means = dataset.group_means("Role_final")
+    year_means = dataset.group_means("Year_final")
+    overall_means = dataset.column_means()
+    frame = dataset.frame
+    first = ~frame["player_lower"].duplicated(keep="first")
+    for _, prow in frame[first].iterrows():
+        yield prow["player_lower"], build_profile_payload(
+            prow, role_means, year_means, overall_means)
+
+
+# ============================================================
+# KEY-VALUE STORE
+# ============================================================
+class ProfileStore:
+    """Read side of the SQLite profile store: one zlib-compressed JSON blob per player."""
+
+    def __init__(self, path: Path):
+        self._conn = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Path = PATH_PROFILES, fingerprint: str = None):
+        """Open the store, or return None if it is missing or built from other data."""
+        if not Path(path).exists():
+            return None
+        store = cls(path)
+        try:
+            stale = store.meta("format") != PROFILE_FORMAT or (
+                fingerprint is not None and store.meta("fingerprint") != fingerprint)
+        except sqlite3.DatabaseError:
+            stale = True  # unreadable / partial file
+        if stale:
+            store.close()
+            return None
+        return store
+
+    def meta(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, player_id: str):
+        """Profile payload for ``player_id`` (None if not stored)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM profiles WHERE player_id = ?", (player_id,)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def close(self):
+        self._conn.close()
+
+
+def write_profile_store(items, path: Path = PATH_PROFILES, fingerprint: str = "") -> int:
+    """Write (player id, payload) pairs to a fresh store; atomically replaces ``path``."""
+    path = Path(path)
+    tmp = path.with_suffix(f"{path.suffix}.{threading.get_ident()}.tmp")
+    tmp.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp)
+    conn.execute("CREATE TABLE profiles (player_id TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    count = 0
+    with conn:
+        for player_id, payload in items:
+            blob = zlib.compress(json.dumps(
+                payload, separators=(",", ":")).encode(), 9)
+            conn.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?)",
+                         (player_id, blob))
+            count += 1
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         [("fingerprint", fingerprint), ("format", PROFILE_FORMAT)])
+    conn.execute("VACUUM")
+    conn.close()
+
+    tmp.replace(path)
+    return count
+
+
+class BackgroundProfileStore:
+    """Profile store that builds itself on a background thread when missing or stale.
+
+    ``get`` returns None until the build finishes; callers build payloads live meanwhile.
+    """
+
+    def __init__(self, dataset, fingerprint: str, path: Path = PATH_PROFILES):
+        self._store = ProfileStore.open(path, fingerprint)
+        if self._store is None:
+            threading.Thread(target=self._build, args=(dataset, fingerprint, path),
+                             name="profile-store-build", daemon=True).start()
+
+    def _build(self, dataset, fingerprint, path):
+        try:
+            write_profile_store(build_dataset_payloads(dataset), path, fingerprint)
+        except (OSError, sqlite3.Error):
+            return  # e.g. read-only filesystem — keep building profiles live
+        self._store = ProfileStore.open(path, fingerprint)
+
+    def get(self, player_id: str):
+        store = self._store
+        return store.get(player_id) if store is not None else None
+
+
+def main():
+    from dataset import data_fingerprint, load_datasets
+
+    print("Loading datasets...")
+    data = load_datasets()
+    print(f"Building profiles for {len(data.combined):,} players...")
+    count = write_profile_store(build_dataset_payloads(data.combined),
+                                PATH_PROFILES, data_fingerprint())
+    print(f"✅ Saved {count:,} profiles to {PATH_PROFILES} "
+          f"({PATH_PROFILES.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,94 @@
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import time
+import argparse
+import asyncio
+import json
+import os
 import re
 
+import pandas as pd
+
+from http_cache import MAX_AGE_DAYS, PATH_HTTP_CACHE, HttpCache
+from scraper import Fetcher, FetchError, Politeness
 
-def get_player_position(player_name):
-    """Scrape position from Sports Reference for a given player."""
-    # Convert player name to URL format (lowercase, replace spaces with hyphens)
-    # Remove special characters
+BASE_URL = "https://www.sports-reference.com/cbb/players"
+# Some players have -1, -2, etc. pages; probing stops at the first that exists
+URL_SUFFIXES = ["", "-1", "-2", "-3"]
+PATH_ALL_ASSISTED = "temp_data/all_assisted.csv"
+# One JSON line per finished player; lets an interrupted run resume where it stopped
+PATH_JOURNAL = "temp_data/scrape_positions.jsonl"
+
+
+def player_slug(player_name):
+    """Sports Reference URL name (lowercase, hyphenated, special characters removed)."""
     clean_name = re.sub(r"[^a-zA-Z\s-]", "", player_name.lower())
-    # Replace spaces with hyphens
-    url_name = clean_name.replace(" ", "-")
+    return clean_name.replace(" ", "-")
 
-    # Try different URL patterns (some players have -1, -2, etc.)
-    for suffix in ["", "-1", "-2", "-3"]:
-        url = f"https://www.sports-reference.com/cbb/players/{url_name}{suffix}.html"
 
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Find position in the meta info
-                meta_div = soup.find('div', {'id': 'meta'})
-                if meta_div:
-                    # Look for position in the text
-                    text = meta_div.get_text()
-
-                    # Position is typically listed as "Position: G" or similar
-                    pos_match = re.search(
-                        r'Position:\s*([A-Z]+(?:-[A-Z]+)?)', text)
-                    if pos_match:
-                        return pos_match.group(1)
-
-        except Exception as e:
-            print(f"Error fetching {player_name} ({url}): {e}")
-            continue
+def parse_position(html):
+    """Position listed in a player page's meta block ("Position: G"), or None."""
+    from bs4 import BeautifulSoup
 
+    soup = BeautifulSoup(html, 'html.parser')
+    meta_div = soup.find('div', {'id': 'meta'})
+    if meta_div:
+        pos_match = re.search(r'Position:\s*([A-Z]+(?:-[A-Z]+)?)', meta_div.get_text())
+        if pos_match:
+            return pos_match.group(1)
     return None
 
 
+async def get_player_position_async(fetcher, player_name, base_url=BASE_URL):
+    """Scrape position from Sports Reference, probing URL suffixes until one exists.
+
+    Raises FetchError if a probe keeps failing, so the player can be retried later
+    instead of being recorded as not found.
+    """
+    slug = player_slug(player_name)
+    for suffix in URL_SUFFIXES:
+        response = await fetcher.get(f"{base_url}/{slug}{suffix}.html")
+        if response.status == 200:
+            return parse_position(response.body)
+        if response.status != 404:
+            raise FetchError(f"{response.url}: HTTP {response.status}")
+    return None
+
+
+def get_player_position(player_name, base_url=BASE_URL):
+    """Blocking single-player lookup."""
+    async def lookup():
+        fetcher = Fetcher()
+        try:
+            return await get_player_position_async(fetcher, player_name, base_url)
+        finally:
+            fetcher.close()
+    return asyncio.run(lookup())
+
+
+async def scrape_positions(players, on_result, politeness=None, base_url=BASE_URL, cache=None):
+    """Look up ``players`` (names) with ``politeness.concurrency`` workers.
+
+    ``on_result(name, position, error)`` is called as each player finishes.
+    Pages (including 404 probes) are served from / stored in ``cache`` when given.
+    """
+    fetcher = Fetcher(politeness, cache)
+    queue = asyncio.Queue()
+    for name in players:
+        queue.put_nowait(name)
+
+    async def worker():
+        while not queue.empty():
+            name = queue.get_nowait()
+            try:
+                position, error = await get_player_position_async(fetcher, name, base_url), None
+            except FetchError as e:
+                position, error = None, e
+            on_result(name, position, error)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(fetcher.politeness.concurrency)))
+    finally:
+        fetcher.close()
+
+
 def standardize_position(position):
     """Standardize position to G, F, or C based on user's rules."""
     if not position or pd.isna(position):
@@ -67,52 +115,125 @@ def standardize_position(position):
     return None
 
 
+# ============================================================
+# CHECKPOINT JOURNAL
+# ============================================================
+def read_journal(path=PATH_JOURNAL):
+    """Player name → standardized position (None = not found) for every journaled player."""
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from a crash
+            results[entry["player"]] = entry["role"]
+    return results
+
+
+class Journal:
+    """Append-only JSONL writer; each result costs one short line, flushed immediately."""
+
+    def __init__(self, path=PATH_JOURNAL):
+        torn = False
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._file = open(path, "a", encoding="utf-8")
+        if torn:
+            self._file.write("\n")  # keep the torn line from swallowing the next entry
+
+    def append(self, player, position, role):
+        self._file.write(json.dumps({"player": player, "position": position, "role": role}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def write_csv_atomic(df, path):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def parse_args():
+    defaults = Politeness()
+    parser = argparse.ArgumentParser(description="Scrape missing positions from Sports Reference.")
+    parser.add_argument("--input", default=PATH_ALL_ASSISTED)
+    parser.add_argument("--journal", default=PATH_JOURNAL)
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="player page root (point at a local stub server for testing)")
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--rate", type=float, default=defaults.rate,
+                        help="requests per second per host (0 = unlimited)")
+    parser.add_argument("--burst", type=int, default=defaults.burst)
+    parser.add_argument("--retries", type=int, default=defaults.retries)
+    parser.add_argument("--backoff", type=float, default=defaults.backoff)
+    parser.add_argument("--cache", default=str(PATH_HTTP_CACHE),
+                        help="HTTP cache file ('' to disable)")
+    parser.add_argument("--max-age", type=float, default=MAX_AGE_DAYS,
+                        help="days before cached pages are revalidated")
+    return parser.parse_args()
+
+
 def main():
-    print("Loading all_assisted.csv...")
-    df = pd.read_csv('temp_data/all_assisted.csv')
+    args = parse_args()
+    politeness = Politeness(concurrency=args.concurrency, rate=args.rate, burst=args.burst,
+                            retries=args.retries, backoff=args.backoff)
+
+    print(f"Loading {args.input}...")
+    df = pd.read_csv(args.input)
     print(f"Total players: {len(df)}")
 
     # Add Role_final column if it doesn't exist
     if 'Role_final' not in df.columns:
         df['Role_final'] = None
-
-    # Process players in batches
-    save_interval = 50  # Save every 50 players in case of crash
-
-    for i, row in df.iterrows():
-        if pd.notna(row.get('Role_final')):
-            continue  # Skip if already has position
-
-        player_name = row['Player']
-
-        print(f"[{i+1}/{len(df)}] Fetching position for {player_name}...")
-
-        position = get_player_position(player_name)
+    df['Role_final'] = df['Role_final'].astype(object)  # all-empty columns load as float
+
+    # Players finished by earlier (possibly interrupted) runs are skipped
+    journaled = read_journal(args.journal)
+    todo = df.loc[df['Role_final'].isna(), 'Player'].drop_duplicates()
+    todo = todo[~todo.isin(journaled.keys())].tolist()
+    print(f"Already journaled: {len(journaled)}")
+    print(f"Fetching positions for {len(todo)} players "
+          f"({politeness.concurrency} at a time, {politeness.rate:g} req/s)...")
+
+    journal = Journal(args.journal)
+    done = 0
+
+    def on_result(player_name, position, error):
+        nonlocal done
+        done += 1
+        if error is not None:
+            # Not journaled, so the next run retries this player
+            print(f"[{done}/{len(todo)}] {player_name}: error {error}")
+            return
         standardized = standardize_position(position)
-
+        journal.append(player_name, position, standardized)
+        journaled[player_name] = standardized
         if standardized:
-            df.at[i, 'Role_final'] = standardized
-            print(f"  → Found: {position} → {standardized}")
+            print(f"[{done}/{len(todo)}] {player_name}: {position} → {standardized}")
         else:
-            print(f"  → Not found or invalid position")
-
-        # Save progress periodically every 50 players
-        if (i + 1) % save_interval == 0:
-            print(f"\n💾 Saving progress at {i+1} players...")
-            df.to_csv('temp_data/all_assisted.csv', index=False)
-            print("Saved!\n")
+            print(f"[{done}/{len(todo)}] {player_name}: not found or invalid position")
 
-        # Be nice to the server
-        time.sleep(1)
+    cache = HttpCache(args.cache, args.max_age) if args.cache else None
+    try:
+        asyncio.run(scrape_positions(todo, on_result, politeness, args.base_url, cache))
+    finally:
+        journal.close()
 
-    # Final save
+    # Apply every journaled result and write the CSV once
     print("\nSaving final results...")
-    df.to_csv('temp_data/all_assisted.csv', index=False)
+    df['Role_final'] = df['Role_final'].fillna(df['Player'].map(journaled))
+    write_csv_atomic(df, args.input)
 
     print(f"\nComplete!")
     print(f"Players with positions: {df['Role_final'].notna().sum()}")
     print(f"Players without positions: {df['Role_final'].isna().sum()}")
 
-
 if __name__ == "__main__":
     main()
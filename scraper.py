@@ -0,0 +1,145 @@
+# ============================================================
+# scraper.py — Polite Concurrent HTTP Fetching
+# ============================================================
+# Shared plumbing for the Sports Reference scrapers. Requests run on worker
+# threads under asyncio with a bounded number in flight, a token bucket per
+# host (steady rate + burst), and retries with exponential backoff on
+# timeouts, connection errors, 429 and 5xx responses.
+#
+# All limits live in Politeness; scripts expose them as command-line flags
+# and take a base URL, so they can be pointed at a local stub server. With an
+# HttpCache attached, fresh cached responses skip the network (and the rate
+# limiter) and stale ones are revalidated with conditional requests.
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+
+USER_AGENT = "Mozilla/5.0"
+# Responses worth retrying; everything else (200, 404, ...) is final
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class Politeness:
+    concurrency: int = 4      # requests in flight at once
+    rate: float = 1.0         # requests per second per host (<= 0 disables)
+    burst: int = 1            # requests a host may receive back to back
+    retries: int = 3          # extra attempts after the first
+    backoff: float = 2.0      # seconds before the first retry, doubled each time
+    timeout: float = 10.0
+
+
+@dataclass
+class Response:
+    url: str
+    status: int
+    body: bytes = b""
+    headers: dict = field(default_factory=dict)
+    cached: bool = False      # served from (or revalidated against) the HttpCache
+
+
+class FetchError(Exception):
+    """A request still failed (error or retryable status) after every retry."""
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second on average, up to ``burst`` at once."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _retry_after(headers) -> float:
+    try:
+        return max(0.0, float(headers.get("Retry-After", 0)))
+    except (TypeError, ValueError):
+        return 0.0  # HTTP-date form — fall back to our own backoff
+
+
+class Fetcher:
+    """Rate-limited, retrying async GET. Create and use within one event loop."""
+
+    def __init__(self, politeness: Politeness = None, cache=None):
+        self.politeness = politeness or Politeness()
+        self.cache = cache
+        self._buckets = {}
+        self._slots = asyncio.Semaphore(self.politeness.concurrency)
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.politeness.concurrency)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.politeness.rate, self.politeness.burst)
+        return self._buckets[host]
+
+    async def _get_once(self, url: str, headers) -> Response:
+        await self._bucket(url).acquire()
+        async with self._slots:
+            resp = await asyncio.to_thread(self._session.get, url, headers=headers,
+                                           timeout=self.politeness.timeout)
+        return Response(url, resp.status_code, resp.content, resp.headers)
+
+    async def get(self, url: str, headers: dict = None) -> Response:
+        """GET ``url`` (through the cache, if any); raises FetchError once retries are exhausted."""
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and self.cache.is_fresh(entry):
+            return Response(url, entry.status, entry.body, cached=True)
+        if entry is not None:
+            headers = {**entry.conditional_headers(), **(headers or {})}
+
+        response = await self._get_retrying(url, headers)
+        if entry is not None and response.status == 304:
+            self.cache.touch(url)
+            return Response(url, entry.status, entry.body, response.headers, cached=True)
+        if self.cache is not None:
+            self.cache.put(url, response.status, response.body, response.headers)
+        return response
+
+    async def _get_retrying(self, url: str, headers) -> Response:
+        p = self.politeness
+        for attempt in range(p.retries + 1):
+            wait = 0.0
+            try:
+                response = await self._get_once(url, headers)
+                if response.status not in RETRY_STATUS:
+                    return response
+                error = f"HTTP {response.status}"
+                wait = _retry_after(response.headers)
+            except requests.RequestException as e:
+                error = str(e) or type(e).__name__
+            if attempt < p.retries:
+                # Jitter keeps parallel retries from hitting the host in lockstep
+                delay = p.backoff * 2 ** attempt * random.uniform(0.5, 1.0)
+                await asyncio.sleep(max(delay, wait))
+        raise FetchError(f"{url}: {error} after {p.retries + 1} attempts")
+
+    def close(self):
+        self._session.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,216 @@
+# ============================================================
+# season_table.py — Per-Player Season Fact Table
+# ============================================================
+# Every player's 12 raw shot counts per season (play-by-play arrays, team
+# splits summed) are stored as cumulative arrays over the seasons 2010-2026:
+# cumulative[p, s] holds player p's totals before season s, so the totals for
+# any window of seasons [lo, hi] are one subtraction per player,
+#
+#     cumulative[p, hi + 1] - cumulative[p, lo]
+#
+# and a whole population is windowed with a single fancy-indexing operation.
+# Windows are either calendar seasons or counted from a player's own first /
+# last season played ("freshman year", "final two seasons"); tab 1 recomputes
+# the full metric set from the windowed counts.
+#
+# Recency weighting uses the dense (players × seasons × 12) count tensor:
+# season s of a window whose last season played is hi gets weight
+# decay ** (hi - s), and the weighted totals of every player are one tensor
+# contraction,
+#
+#     np.einsum("ps,psk->pk", weights, counts)
+#
+# The table is stored as a .npz tagged with the data fingerprint.
+# Build offline with `python season_table.py`.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_arrays, save_arrays
+from process_json_data import STAT_COLS, YEARS, add_shot_metrics, load_pbp_seasons
+
+PATH_SEASON_TABLE = Path(__file__).parent / "temp_data" / "season_table.npz"
+# Bump when the table layout changes so older tables are rebuilt
+SEASON_TABLE_FORMAT = "1"
+
+# Tab 1 season windows: label → (anchor, seasons); "calendar" uses a season range
+WINDOWS = {
+    "Full career": None,
+    "Freshman year": ("first", 1),
+    "First two seasons": ("first", 2),
+    "Final two seasons": ("last", 2),
+    "Final season": ("last", 1),
+    "Custom seasons": ("calendar", None),
+}
+
+
+class SeasonTable:
+    """Cumulative season counts per player (keyed by player_lower)."""
+
+    def __init__(self, player_lower: np.ndarray, seasons: np.ndarray, cumulative: np.ndarray):
+        self.player_lower = pd.Index(player_lower, name="player_lower")
+        self.seasons = np.asarray(seasons)
+        self.cumulative = cumulative                      # (players, seasons + 1, 12)
+        self.counts = np.diff(cumulative, axis=1).astype(np.float32)  # (players, seasons, 12)
+        # Seasons played so far, same layout (a season counts if it has any shot)
+        played = (self.counts != 0).any(axis=2)
+        self.played = np.concatenate(
+            [np.zeros((len(played), 1), np.int16), played.cumsum(axis=1, dtype=np.int16)], axis=1)
+
+    def __len__(self) -> int:
+        return len(self.player_lower)
+
+    def rows(self, player_lower) -> np.ndarray:
+        """Table row of each player_lower value (-1 where the player has no seasons)."""
+        return self.player_lower.get_indexer(pd.Index(player_lower))
+
+    def bounds(self, rows: np.ndarray, anchor: str, n: int = 1, season_range=None):
+        """Inclusive season positions (lo, hi) of a window for each row."""
+        played = self.played[rows]
+        first_played = (played[:, 1:] < 1).sum(axis=1)
+        if anchor == "calendar":
+            first, last = season_range
+            lo = np.maximum(np.searchsorted(self.seasons, first), first_played)
+            end = np.searchsorted(self.seasons, last, side="right") - 1
+            # Last season played in the range, so recency weights start there
+            hi = np.minimum((played[:, 1:] < played[:, end + 1:end + 2]).sum(axis=1), end)
+        elif anchor == "first":
+            lo = first_played
+            hi = (played[:, 1:] < n).sum(axis=1)      # n-th season played
+        elif anchor == "last":
+            total = played[:, -1:]
+            lo = np.maximum((played[:, 1:] <= total - n).sum(axis=1), first_played)
+            hi = (played[:, 1:] < total).sum(axis=1)  # last season played
+        else:
+            raise ValueError(f"unknown window anchor: {anchor}")
+        return lo, np.minimum(hi, len(self.seasons) - 1)
+
+    def weights(self, lo: np.ndarray, hi: np.ndarray, decay: float) -> np.ndarray:
+        """(rows, seasons) weights decay ** (hi - s) inside each [lo, hi] window, 0 outside."""
+        s = np.arange(len(self.seasons))
+        powers = np.float32(decay) ** s.astype(np.float32)
+        age = hi[:, None] - s
+        inside = (s >= lo[:, None]) & (age >= 0)
+        return np.where(inside, powers[np.clip(age, 0, len(s) - 1)], np.float32(0))
+
+    def window(self, player_lower, anchor: str, n: int = 1, season_range=None,
+               decay: float = 1.0) -> pd.DataFrame:
+        """Raw counts within a season window plus the window's first / last season.
+
+        With ``decay`` < 1 the counts are recency-weighted (the player's last
+        season played in the window has weight 1). Players without any season
+        in the window (or not in the table) get NaN.
+        """
+        rows = self.rows(player_lower)
+        known = rows >= 0
+        lo, hi = self.bounds(rows[known], anchor, n, season_range)
+        hi = np.maximum(hi, lo - 1)                   # empty window
+        played = self.played[rows[known]]
+        take = np.arange(len(lo))
+        if decay == 1:
+            cum = self.cumulative[rows[known]]
+            counts = cum[take, hi + 1] - cum[take, lo]
+        else:
+            counts = np.einsum("ps,psk->pk", self.weights(lo, hi, decay),
+                               self.counts[rows[known]])
+        seasons = played[take, hi + 1] - played[take, lo]
+
+        out = np.full((len(rows), len(STAT_COLS)), np.nan)
+        out[known] = np.where(seasons[:, None] > 0, counts, np.nan)
+        window = pd.DataFrame(out, columns=STAT_COLS, index=pd.Index(player_lower).rename(None))
+        first = np.full(len(rows), np.nan)
+        last = np.full(len(rows), np.nan)
+        in_window = seasons > 0
+        first[np.flatnonzero(known)[in_window]] = self.seasons[lo[in_window]]
+        last[np.flatnonzero(known)[in_window]] = self.seasons[hi[in_window]]
+        window["Window_First"] = first
+        window["Window_Last"] = last
+        return window
+
+    def save(self, path: Path = PATH_SEASON_TABLE, fingerprint: str = ""):
+        """Write the table to ``path`` (atomically replaced)."""
+        save_arrays(path, fingerprint, SEASON_TABLE_FORMAT,
+                    player_lower=self.player_lower.to_numpy(dtype=str),
+                    seasons=self.seasons, cumulative=self.cumulative)
+
+    @classmethod
+    def open(cls, path: Path = PATH_SEASON_TABLE, fingerprint: str = None):
+        """Load the table, or return None if it is missing or built from other data."""
+        arrays = load_arrays(path, fingerprint, SEASON_TABLE_FORMAT)
+        if arrays is None:
+            return None
+        return cls(arrays["player_lower"].astype(object), arrays["seasons"], arrays["cumulative"])
+
+
+def build_season_table(json_dir=Path(__file__).parent / "temp_data", years=YEARS,
+                       verbose: bool = False) -> SeasonTable:
+    """Cumulative per-season counts for every player in the play-by-play arrays."""
+    seasons = load_pbp_seasons(json_dir, years, verbose)
+    for col in STAT_COLS:
+        seasons[col] = pd.to_numeric(seasons[col], errors="coerce").fillna(0)
+    seasons["player_lower"] = seasons["Player"].str.lower().str.strip()
+
+    players, player_codes = np.unique(seasons["player_lower"].to_numpy(dtype=str),
+                                      return_inverse=True)
+    years = np.arange(seasons["Year"].min(), seasons["Year"].max() + 1)
+    counts = np.zeros((len(players), len(years), len(STAT_COLS)), np.int32)
+    # Team splits of a season land in the same cell and are summed
+    np.add.at(counts, (player_codes, seasons["Year"].to_numpy() - years[0]),
+              seasons[STAT_COLS].to_numpy(np.int32))
+
+    cumulative = np.zeros((len(players), len(years) + 1, len(STAT_COLS)), np.int32)
+    np.cumsum(counts, axis=1, out=cumulative[:, 1:])
+    return SeasonTable(players.astype(object), years, cumulative)
+
+
+def window_metrics(frame: pd.DataFrame, table: SeasonTable, window: str,
+                   season_range=None, decay: float = 1.0) -> pd.DataFrame:
+    """``frame`` restricted to a WINDOWS entry, with counts and metrics recomputed.
+
+    ``decay`` < 1 weights each season by decay ** (seasons until the window's
+    last season). Players without a season in the window are dropped.
+    """
+    spec = WINDOWS[window]
+    if spec is None:
+        if decay == 1:
+            return frame
+        spec = ("last", len(table.seasons))       # whole career, weighted
+    anchor, n = spec
+    counts = table.window(frame["player_lower"], anchor, n or 1, season_range, decay)
+    keep = counts["Window_First"].notna().to_numpy()
+    frame = frame[keep]
+    counts = counts[keep]
+    for col in counts.columns:
+        frame[col] = counts[col].to_numpy()
+
+    frame = add_shot_metrics(frame)
+    frame["DunkAtt"] = frame["DunkMade"] + frame["DunkMiss"]
+    frame["Dunk_Freq"] = frame["DunkAtt"] / frame["Total_Att"].replace({0: np.nan})
+    frame["Dunk_FG%"] = frame["DunkMade"] / frame["DunkAtt"].replace({0: np.nan})
+    return frame
+
+
+def check_recency_weights(table: SeasonTable, decay: float = 0.5):
+    """Every player's last season played in the full range must get weight 1."""
+    rows = np.arange(len(table))
+    lo, hi = table.bounds(rows, "calendar", season_range=(table.seasons[0], table.seasons[-1]))
+    weights = table.weights(lo, hi, decay)
+    played = (table.counts[rows, hi] != 0).any(axis=1)
+    active = table.played[:, -1] > 0
+    if not (np.all(weights[rows, hi][active] == 1) and np.all(played[active])):
+        raise ValueError("recency weights are not anchored on each player's last season")
+
+
+def main():
+    from dataset import data_fingerprint
+
+    table = build_season_table(verbose=True)
+    check_recency_weights(table)
+    table.save(PATH_SEASON_TABLE, data_fingerprint())
+    print(f"✅ Saved {len(table):,} players × {len(table.seasons)} seasons to {PATH_SEASON_TABLE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+# ============================================================
+# similarity.py — Player Similarity Features + Queries
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+# Core metrics that all players should have (excluding Height)
+CORE_METRICS = [
+    'Rim_Freq', 'Mid_Freq', 'Three_Freq', 'TwoPt_Freq',
+    'RimAtt', 'Mid_Att', 'Three_Att',
+    'Total_Assisted%', 'Mid_Assisted%', 'Three_Assisted%', 'TwoPt_Assisted%', 'NonDunk_Assisted%',
+    'Three_FG%', 'Total_Rim%'
+]
+
+# Full metrics including Height (for 2026 players)
+SIMILARITY_METRICS = CORE_METRICS + ['Height']
+
+# Feature groups exposed as weight sliders in tab 3
+WEIGHT_GROUPS = {
+    "Shot frequency": ['Rim_Freq', 'Mid_Freq', 'Three_Freq', 'TwoPt_Freq'],
+    "Volume": ['RimAtt', 'Mid_Att', 'Three_Att'],
+    "Assisted%": ['Total_Assisted%', 'Mid_Assisted%', 'Three_Assisted%',
+                  'TwoPt_Assisted%', 'NonDunk_Assisted%'],
+    "Efficiency": ['Three_FG%', 'Total_Rim%'],
+    "Height": ['Height'],
+}
+
+# Default importance per group: volume and height count twice (as if their
+# columns were duplicated). Importance is the squared per-feature weight.
+DEFAULT_IMPORTANCE = {"Shot frequency": 1.0, "Volume": 2.0, "Assisted%": 1.0,
+                      "Efficiency": 1.0, "Height": 2.0}
+
+# Two players are only compared if they share at least this fraction of the
+# query player's available features; otherwise their similarity is 0.
+MIN_OVERLAP = 0.5
+
+
+def group_weights(importance: dict = None) -> dict:
+    """Per-metric weights from per-group importance (defaults for missing groups)."""
+    importance = {**DEFAULT_IMPORTANCE, **(importance or {})}
+    return {m: float(np.sqrt(max(importance[g], 0.0)))
+            for g, metrics in WEIGHT_GROUPS.items() for m in metrics}
+
+
+def masked_cosine(q, q_mask, matrix, squared, mask, w, min_overlap: float = MIN_OVERLAP):
+    """Weighted cosine similarity over the features both sides have.
+
+    ``q``/``matrix`` are standardized values with missing entries set to 0 and
+    ``q_mask``/``mask`` mark the present ones (``squared`` is ``matrix ** 2``).
+    Each norm is taken over the overlap only, so a pair is renormalized to the
+    features it shares. ``q`` may be one query (1-D) or a block of queries (2-D).
+    """
+    w2 = w * w
+    dots = (q * w2) @ matrix.T
+    row_norms = np.sqrt((q_mask * w2) @ squared.T)
+    query_norms = np.sqrt((q * q * w2) @ mask.T)
+    overlap = q_mask @ mask.T
+    need = np.ceil(min_overlap * q_mask.sum(axis=-1, keepdims=True))
+
+    denom = row_norms * query_norms
+    valid = (denom > 0) & (overlap >= np.maximum(need, 1))
+    return np.divide(dots, denom, out=np.zeros_like(dots), where=valid)
+
+
+class FeatureMatrix:
+    """Standardized similarity features for one candidate pool, built once per data version.
+
+    Missing metrics stay missing: the standardized matrix (missing → 0) is stored
+    as a contiguous float32 array next to a presence mask, and similarity uses
+    ``masked_cosine`` over each pair's shared features, so no rows are dropped.
+    Feature weights are applied at query time and never refit the matrix.
+    """
+
+    def __init__(self, frame: pd.DataFrame, metrics: list):
+        self.metrics = list(metrics)
+        self.players = frame["Player"].to_numpy()
+        self.roles = frame["Role_final"].to_numpy()
+        self.row_index = frame.index
+        self.positions = {}
+        for pos, name in enumerate(self.players):
+            self.positions.setdefault(name, []).append(pos)
+
+        raw = frame[self.metrics].to_numpy(dtype=float, na_value=np.nan)
+        present = np.isfinite(raw)
+        filled = np.where(present, raw, 0.0)
+
+        # Standardize each column over the players that have it, dropping constant columns
+        count = present.sum(axis=0)
+        mean = np.divide(filled.sum(axis=0), count,
+                         out=np.zeros(len(self.metrics)), where=count > 0)
+        sq_dev = np.where(present, (filled - mean) ** 2, 0.0).sum(axis=0)
+        std = np.sqrt(np.divide(sq_dev, count,
+                                out=np.zeros(len(self.metrics)), where=count > 0))
+        self.keep = std > 1e-10
+        self.mean = mean[self.keep]
+        self.scale = std[self.keep]
+
+        self.mask = np.ascontiguousarray(present[:, self.keep], dtype=np.float32)
+        self.matrix = np.ascontiguousarray(
+            self._standardize(filled) * self.mask, dtype=np.float32)
+        self._squared = self.matrix ** 2
+        self.complete = self.mask.all(axis=1)
+        self.default_weights = self.weight_vector()
+        self.norms = np.sqrt(self._squared @ self.default_weights ** 2)
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    @property
+    def empty(self) -> bool:
+        """True when every feature has zero variance (no similarity possible)."""
+        return not self.keep.any()
+
+    def _standardize(self, raw: np.ndarray) -> np.ndarray:
+        return (raw[..., self.keep] - self.mean) / self.scale
+
+    def weight_vector(self, weights: dict = None) -> np.ndarray:
+        """Weights for the kept feature columns (``weights``: metric → weight)."""
+        weights = group_weights() if weights is None else weights
+        w = np.array([weights.get(m, 1.0) for m in self.metrics], dtype=np.float32)
+        return w[self.keep]
+
+    def weighted_matrix(self, w: np.ndarray = None) -> np.ndarray:
+        """The matrix with weights applied to its columns (e.g. to build a tree index)."""
+        w = self.default_weights if w is None else w
+        return self.matrix * w
+
+    def transform(self, values):
+        """Standardize raw metric values (ordered like ``metrics``; one row or 2-D).
+
+        Returns ``(values, mask)`` with missing entries set to 0 in ``values``.
+        """
+        raw = np.asarray(values, dtype=float)
+        present = np.isfinite(raw)[..., self.keep]
+        z = np.where(present, self._standardize(np.where(np.isfinite(raw), raw, 0.0)), 0.0)
+        return z.astype(np.float32), present.astype(np.float32)
+
+    def similarities(self, values, w: np.ndarray = None) -> np.ndarray:
+        """Weighted, NaN-aware cosine similarity of one player's raw values against every row."""
+        w = self.default_weights if w is None else w
+        q, q_mask = self.transform(values)
+        return masked_cosine(q, q_mask, self.matrix, self._squared, self.mask, w)
+
+
+class SimilarityIndex:
+    """Top-k cosine neighbours over a FeatureMatrix, without scoring/sorting every row.
+
+    Small pools use a masked ``argpartition`` over the scores. Large pools (e.g.
+    the all-college set) use a BallTree over the unit-normalized rows that have
+    every feature, where Euclidean order equals cosine order, so a query only
+    touches a few leaves; rows with missing features are scored directly. The
+    tree serves complete queries at the default weights only.
+    """
+
+    TREE_MIN_ROWS = 5000
+    # Rows scored per block on the brute-force path (bounds temporary memory)
+    CHUNK_ROWS = 8192
+
+    def __init__(self, features: FeatureMatrix):
+        self.features = features
+        self._tree = None
+        self._tree_rows = np.flatnonzero(features.complete)
+        if len(self._tree_rows) >= self.TREE_MIN_ROWS and not features.empty:
+            from sklearn.neighbors import BallTree
+
+            rows = self._tree_rows
+            norms = np.where(features.norms[rows] > 0, features.norms[rows], 1.0)
+            self._tree = BallTree(features.weighted_matrix()[rows] / norms[:, None])
+
+    def _score(self, q, q_mask, w, positions: np.ndarray) -> np.ndarray:
+        """Exact weighted, NaN-aware cosine scores for the given pool rows."""
+        f = self.features
+        return masked_cosine(q, q_mask, f.matrix[positions], f._squared[positions],
+                             f.mask[positions], w)
+
+    @staticmethod
+    def _best(positions: np.ndarray, scores: np.ndarray, k: int):
+        """The k highest scores, best first (ties keep pool order)."""
+        if len(scores) > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[part], scores[part]
+        order = np.lexsort((positions, -scores))
+        return positions[order], scores[order]
+
+    def _tree_top_k(self, wq: np.ndarray, allowed: np.ndarray, k: int) -> np.ndarray:
+        """Pool positions of the nearest allowed complete rows (widening until k are found)."""
+        q_norm = np.linalg.norm(wq)
+        unit_q = (wq / q_norm if q_norm > 0 else wq).reshape(1, -1)
+        n = len(self._tree_rows)
+        n_allowed = int(allowed[self._tree_rows].sum())
+        fetch = k + (n - n_allowed) + 8
+        while True:
+            fetch = min(fetch, n)
+            found = self._tree_rows[self._tree.query(
+                unit_q, k=fetch, return_distance=False)[0]]
+            found = found[allowed[found]]
+            if len(found) >= k or fetch == n:
+                return found
+            fetch *= 2
+
+    def top_k(self, values, k: int, exclude=(), candidates=None, weights: dict = None):
+        """Return (pool positions, cosine scores) of the k most similar rows.
+
+        ``exclude`` lists pool positions to skip (e.g. the query player); ``candidates``
+        is an optional boolean mask restricting the pool (e.g. NBA players only);
+        ``weights`` maps metric → feature weight (default: ``group_weights()``).
+        """
+        features = self.features
+        q, q_mask = features.transform(values)
+        w = features.weight_vector(weights)
+        n = len(features)
+        allowed = np.ones(n, dtype=bool) if candidates is None else np.asarray(
+            candidates, dtype=bool).copy()
+        allowed[list(exclude)] = False
+        k = min(k, int(allowed.sum()))
+        best_pos = np.empty(0, dtype=np.intp)
+        best_scores = np.empty(0, dtype=np.float32)
+        if k <= 0:
+            return best_pos, best_scores
+
+        # Complete query at default weights: the tree is exact on complete rows,
+        # leaving only the rows with missing features to score directly
+        brute = allowed
+        if (self._tree is not None and q_mask.all()
+                and np.array_equal(w, features.default_weights)
+                and allowed[self._tree_rows].sum() >= self.TREE_MIN_ROWS):
+            found = self._tree_top_k(w * q, allowed, k)
+            best_pos, best_scores = self._best(found, self._score(q, q_mask, w, found), k)
+            brute = allowed & ~features.complete
+
+        for start in range(0, n, self.CHUNK_ROWS):
+            positions = start + np.flatnonzero(brute[start:start + self.CHUNK_ROWS])
+            if len(positions):
+                best_pos, best_scores = self._best(
+                    np.concatenate([best_pos, positions]),
+                    np.concatenate([best_scores, self._score(q, q_mask, w, positions)]), k)
+        return best_pos, best_scores
+
+
+def _pool_frame(df: pd.DataFrame, metrics: list, required: list) -> pd.DataFrame:
+    """Numeric metric columns (pd.NA → NaN) plus ``required`` labels, keeping every
+    row that has its labels and at least one core metric."""
+    pool = df[metrics].apply(pd.to_numeric, errors="coerce").astype(float)
+    pool[['Player', 'Role_final']] = df[['Player', 'Role_final']]
+    keep = pool[required].notna().all(axis=1) & pool[CORE_METRICS].notna().any(axis=1)
+    return pool[keep]
+
+
+def build_similarity_frame(df_combined: pd.DataFrame) -> pd.DataFrame:
+    """NBA + 2026 pool: every player with a role; missing metrics (e.g. Height for NBA players) stay NaN."""
+    metrics = [m for m in SIMILARITY_METRICS if m in df_combined.columns]
+    return _pool_frame(df_combined, metrics, ['Player', 'Role_final'])
+
+
+def build_college_similarity_frame(df_college: pd.DataFrame) -> pd.DataFrame:
+    """All-college pool: every named player (Role_final may be missing for non-NBA players)."""
+    return _pool_frame(df_college, CORE_METRICS, ['Player'])
+
+
+def feature_matrix(similarity_data, nba_only: bool = False) -> FeatureMatrix:
+    """Cached FeatureMatrix for the similarity dataset (all players, or NBA-only without Height)."""
+    if nba_only:
+        nba = similarity_data.index.nba_players
+        return similarity_data.view(("features", "nba"), lambda f: FeatureMatrix(
+            f[f['Player'].isin(nba)], CORE_METRICS))
+    metrics = [m for m in SIMILARITY_METRICS if m in similarity_data.columns]
+    return similarity_data.view(("features", "all"),
+                                lambda f: FeatureMatrix(f, metrics))
+
+
+def similarity_index(similarity_data, nba_only: bool = False) -> SimilarityIndex:
+    """Cached top-k index over ``feature_matrix(similarity_data, nba_only)``."""
+    return similarity_data.view(("knn", "nba" if nba_only else "all"),
+                                lambda f: SimilarityIndex(feature_matrix(similarity_data, nba_only)))
+
+
+def nba_mask(similarity_data) -> np.ndarray:
+    """Boolean mask over the pool rows of ``feature_matrix(similarity_data)``: made the NBA."""
+    players = feature_matrix(similarity_data).players
+    nba = similarity_data.index.nba_players
+    return similarity_data.view("nba_mask", lambda f: np.fromiter(
+        (p in nba for p in players), bool, len(players)))
+
+
+# ============================================================
+# RADAR SCALING
+# ============================================================
+# Quantiles cached per dataset (robust scaling uses the outer pair)
+SCALER_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class MetricScaler:
+    """Cached per-metric bounds and pre-sorted columns for one dataset.
+
+    ``bounds`` holds min, max and quantiles for each metric, so scaling a
+    player's values is a few array lookups instead of a scan per metric.
+    """
+
+    def __init__(self, frame: pd.DataFrame, metrics: list):
+        self.metrics = list(metrics)
+        self.sorted = {}
+        rows = []
+        for metric in self.metrics:
+            col = pd.to_numeric(frame[metric], errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan) if metric in frame.columns else np.empty(0)
+            col = np.sort(col[np.isfinite(col)])
+            self.sorted[metric] = col
+            rows.append([col[0], col[-1], *np.quantile(col, SCALER_QUANTILES)]
+                        if len(col) else [np.nan] * (2 + len(SCALER_QUANTILES)))
+        self.bounds = pd.DataFrame(
+            rows, index=self.metrics,
+            columns=["min", "max"] + [f"q{int(q * 100):02d}" for q in SCALER_QUANTILES])
+
+    def _scale(self, values, low: str, high: str) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        lo = self.bounds[low].to_numpy()
+        span = self.bounds[high].to_numpy() - lo
+        return np.divide(values - lo, span, out=np.full_like(values, 0.5), where=span > 0)
+
+    def minmax(self, values) -> np.ndarray:
+        """Min-max scale values ordered like ``metrics`` (0.5 for constant metrics)."""
+        return self._scale(values, "min", "max")
+
+    def robust(self, values) -> np.ndarray:
+        """Scale by the 5th–95th percentile range, clipped to [0, 1]."""
+        return np.clip(self._scale(values, "q05", "q95"), 0.0, 1.0)
+
+    def percentile(self, values) -> np.ndarray:
+        """Percentile rank of each value within its metric (ties take the mid rank)."""
+        out = np.full(len(self.metrics), np.nan)
+        for i, (metric, value) in enumerate(zip(self.metrics, values)):
+            col = self.sorted[metric]
+            if len(col) and pd.notna(value):
+                below = np.searchsorted(col, value, side="left")
+                upto = np.searchsorted(col, value, side="right")
+                out[i] = (below + upto) / (2 * len(col))
+        return out
+
+
+def metric_scaler(dataset, metrics) -> MetricScaler:
+    """Cached MetricScaler for ``metrics`` over a Dataset handle."""
+    metrics = tuple(metrics)
+    return dataset.view(("scaler", metrics), lambda f: MetricScaler(f, metrics))
@@ -8,50 +8,18 @@ import pandas as pd
 import streamlit as st
 from pathlib import Path
 from utils import compute_metrics, grouped_player_role_year_overall_chart
-import os
-import base64
-
-# Helper function to convert image to base64
-
-
-def get_base64_image(image_path):
-    """Convert image to base64 string for HTML embedding"""
-    with open(image_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
-
-# Helper function to get player image
-
-
-def get_player_image(player_name):
-    """Look up player image by name in temp_data/player_images/"""
-    if not player_name:
-        return None
-
-    # Normalize the player name for matching
-    normalized_name = player_name.replace(
-        ".", "").replace("'", "").replace("-", " ")
-
-    # Look in player_images folder
-    image_folder = Path('temp_data/player_images')
-    if not image_folder.exists():
-        return None
-
-    # Try to find matching image
-    # Format is: {ID}_{First_Name}_{Last_Name}.png
-    pattern = f"*_{normalized_name.replace(' ', '_')}.png"
-    matches = list(image_folder.glob(pattern))
-
-    if matches:
-        return str(matches[0])
-
-    # Try with hyphens instead of underscores
-    pattern = f"*_{normalized_name.replace(' ', '-')}.png"
-    matches = list(image_folder.glob(pattern))
-
-    if matches:
-        return str(matches[0])
-
-    return None
+from archetypes import PATH_ARCHETYPES, ArchetypeTable, build_archetype_table
+from artifacts import open_or_build
+from dataset import PATH_ASSISTED, data_fingerprint, data_version, load_datasets
+from neighbors import PATH_NEIGHBORS, NeighborTable, build_neighbor_table
+from player_images import ImageManifest, images_version, thumbnail_base64
+from player_map import PATH_PLAYER_MAP, PlayerMap, build_player_map
+from profiles import BackgroundProfileStore
+from season_table import (PATH_SEASON_TABLE, WINDOWS, SeasonTable, build_season_table,
+                          window_metrics)
+from similarity import (DEFAULT_IMPORTANCE, build_college_similarity_frame,
+                        build_similarity_frame, group_weights, metric_scaler, nba_mask,
+                        similarity_index as get_similarity_index)
 
 
 # ============================================================
@@ -167,188 +135,79 @@ section[data-testid="stSidebar"] small {
 # PATHS + LOAD
 # ============================================================
 ROOT = Path(__file__).parent
-PATH_ASSISTED = ROOT / "temp_data" / "nba_complete_assisted.csv"
-PATH_NBA_PLAYERS = ROOT / "temp_data" / "nba_players.csv"
-PATH_CAREER = ROOT / "temp_data" / "career_drafted.csv"
-PATH_BART = ROOT / "temp_data" / "Bart_Core_Positions.csv"
-PATH_ALL_ASSISTED = ROOT / "temp_data" / "all_assisted.csv"
-PATH_2026_STATS = ROOT / "temp_data" / "2026_stats.csv"
-PATH_2026_CURRENT = ROOT / "temp_data" / "2026_current_players.csv"
-
-
-@st.cache_data
-def load_data():
-    # Debug: Check if files exist
-    if not PATH_ASSISTED.exists():
-        st.error(f"File not found: {PATH_ASSISTED}")
-        st.error(f"Current directory: {Path.cwd()}")
-        st.error(
-            f"Files in temp_data: {list((ROOT / 'temp_data').glob('*')) if (ROOT / 'temp_data').exists() else 'temp_data folder not found'}")
-        st.stop()
-
-    # Load the complete dataset that already has all metrics calculated
-    with st.spinner("Loading comprehensive player dataset..."):
-        df_complete = pd.read_csv(PATH_ASSISTED, low_memory=False)
-        df_nba_players = pd.read_csv(PATH_NBA_PLAYERS, low_memory=False)
-        df_career = pd.read_csv(PATH_CAREER, low_memory=False)
-        df_bart = pd.read_csv(PATH_BART, low_memory=False)
-
-        # Load 2026 current players if available
-        if PATH_2026_CURRENT.exists():
-            df_2026_current = pd.read_csv(PATH_2026_CURRENT, low_memory=False)
-        else:
-            df_2026_current = None
 
-        # Load 2026 stats if available
-        if PATH_2026_STATS.exists():
-            df_2026 = pd.read_csv(PATH_2026_STATS, low_memory=False)
-        else:
-            df_2026 = None
 
-        # Load all_assisted if available (optional for cloud deployment)
-        if PATH_ALL_ASSISTED.exists():
-            df_all_assisted = pd.read_csv(PATH_ALL_ASSISTED, low_memory=False)
-        else:
-            df_all_assisted = None
+@st.cache_resource(show_spinner=False)
+def load_data(version):
+    """Load every dataset once per data version; handles are shared read-only across reruns."""
+    return load_datasets(version)
 
-    # Ensure player_lower column exists
-    if "player_lower" not in df_complete.columns:
-        df_complete["player_lower"] = df_complete["Player"].astype(
-            str).str.lower().str.strip()
 
-    for df_temp in (df_nba_players, df_career, df_bart):
-        if "Player_lower" in df_temp.columns:
-            df_temp["player_lower"] = df_temp["Player_lower"].astype(
-                str).str.lower().str.strip()
-        else:
-            df_temp["player_lower"] = df_temp["Player"].astype(
-                str).str.lower().str.strip()
-
-    # Add player_lower to 2026 stats if available
-    if df_2026 is not None:
-        if "Player_lower" in df_2026.columns:
-            df_2026["player_lower"] = df_2026["Player_lower"].astype(
-                str).str.lower().str.strip()
-        else:
-            df_2026["player_lower"] = df_2026["Player"].astype(
-                str).str.lower().str.strip()
-
-    # Use complete NBA players data first (includes undrafted), then fallback to drafted-only data
-    df_nba_slim = df_nba_players[["player_lower",
-                                  "Role", "YR"]].drop_duplicates("player_lower")
-    df_career_slim = df_career[["player_lower",
-                                "Role", "YR"]].drop_duplicates("player_lower")
-    df_bart_slim = df_bart[["player_lower", "Role",
-                            "YYR"]].drop_duplicates("player_lower")
-
-    # Add 2026 stats slim version
-    if df_2026 is not None:
-        df_2026_slim = df_2026[["player_lower", "Role",
-                                "YR"]].drop_duplicates("player_lower")
-    else:
-        df_2026_slim = None
-
-    # Merge with priority: 2026_stats > nba_players (all) > career_drafted > bart
-    df = df_complete.copy()
-
-    if df_2026_slim is not None:
-        df = df.merge(df_2026_slim, on="player_lower",
-                      how="left", suffixes=("", "_2026"))
-
-    df = df.merge(df_nba_slim, on="player_lower", how="left",
-                  suffixes=("", "_nba") if df_2026_slim is not None else ("", ""))
-    df = df.merge(df_career_slim, on="player_lower",
-                  how="left", suffixes=("", "_career"))
-    df = df.merge(df_bart_slim, on="player_lower",
-                  how="left", suffixes=("", "_bart"))
-
-    # Create final role and year with priority order: 2026 > nba > career > bart
-    if df_2026_slim is not None:
-        df["Role_final"] = df.get("Role", df.get("Role_2026")).fillna(
-            df.get("Role_nba", df.get("Role"))).fillna(
-            df.get("Role_career")).fillna(df.get("Role_bart"))
-        df["Year_final"] = df.get("YR", df.get("YR_2026")).fillna(
-            df.get("YR_nba", df.get("YR")))
-    else:
-        df["Role_final"] = df["Role"].fillna(
-            df["Role_career"]).fillna(df["Role_bart"])
-        df["Year_final"] = df["YR"].fillna(df["YYR"])
-
-    # Process all_assisted data (non-NBA players) if available
-    df_all_computed = None
-    if df_all_assisted is not None:
-        if "Player_lower" in df_all_assisted.columns:
-            df_all_assisted["player_lower"] = df_all_assisted["Player_lower"].astype(
-                str).str.lower().str.strip()
-        elif "player_lower" not in df_all_assisted.columns:
-            df_all_assisted["player_lower"] = df_all_assisted["Player"].astype(
-                str).str.lower().str.strip()
-
-        # Compute metrics for all_assisted data
-        from utils import compute_metrics
-        df_all_computed = compute_metrics(df_all_assisted, df_career, df_bart)
-
-    # Add dunk metrics to NBA dataset (df) as well
-    if "DunkMade" in df.columns and "DunkMiss" in df.columns:
-        df["DunkAtt"] = df["DunkMade"] + df["DunkMiss"]
-        df["Total_Att"] = df.get("RimAtt", 0) + \
-            df.get("Mid_Att", 0) + df.get("Three_Att", 0)
-        df["Dunk_Freq"] = df["DunkAtt"].div(
-            df["Total_Att"].replace({0: pd.NA}))
-        df["Dunk_FG%"] = df["DunkMade"].div(df["DunkAtt"].replace({0: pd.NA}))
-
-    # Process 2026 current players if available
-    if df_2026_current is not None:
-        # Ensure player_lower exists
-        if "player_lower" not in df_2026_current.columns:
-            df_2026_current["player_lower"] = df_2026_current["Player"].astype(
-                str).str.lower().str.strip()
-        # Add Role_final and Year_final
-        df_2026_current["Role_final"] = df_2026_current["Role"]
-        df_2026_current["Year_final"] = df_2026_current["YR"]
-
-        # Convert Height from "6-5" format to inches
-        if "Height" in df_2026_current.columns:
-            def height_to_inches(height_str):
-                try:
-                    if pd.isna(height_str) or height_str == '':
-                        return None
-                    parts = str(height_str).split('-')
-                    if len(parts) == 2:
-                        feet, inches = int(parts[0]), int(parts[1])
-                        return feet * 12 + inches
-                    return None
-                except:
-                    return None
+@st.cache_resource(show_spinner=False)
+def load_profile_store(version):
+    """Precomputed profile store; (re)built in the background if missing or stale."""
+    return BackgroundProfileStore(load_data(version).combined, data_fingerprint())
+
+
+@st.cache_resource(show_spinner=False)
+def load_neighbor_table(version):
+    """Precomputed top-k similar players; built in-process if missing or stale."""
+    return open_or_build(NeighborTable, PATH_NEIGHBORS, data_fingerprint(), lambda: build_neighbor_table(
+        load_data(version).combined.derive("similarity", build_similarity_frame), workers=0))
+
 
-            df_2026_current['Height'] = df_2026_current['Height'].apply(
-                height_to_inches)
+@st.cache_resource(show_spinner=False)
+def load_archetypes(version):
+    """Precomputed shot-profile archetypes; fitted in-process if missing or stale."""
+    return open_or_build(ArchetypeTable, PATH_ARCHETYPES, data_fingerprint(),
+                         lambda: build_archetype_table(load_data(version)))
 
-    return df, df_complete, df_nba_players, df_career, df_bart, df_all_computed, df_2026_current
 
+@st.cache_resource(show_spinner=False)
+def load_player_map(version):
+    """Precomputed 2D player map coordinates; embedded in-process if missing or stale."""
+    return open_or_build(PlayerMap, PATH_PLAYER_MAP, data_fingerprint(),
+                         lambda: build_player_map(load_data(version)))
+
+
+@st.cache_resource(show_spinner=False)
+def load_season_table(version):
+    """Per-player cumulative season counts; built in-process if missing or stale."""
+    return open_or_build(SeasonTable, PATH_SEASON_TABLE, data_fingerprint(), build_season_table)
+
+
+@st.cache_resource(show_spinner=False)
+def load_image_manifest(version):
+    """Player image manifest; rescanned only when the image folder changes."""
+    return ImageManifest()
+
+
+# Debug: Check if files exist
+if not PATH_ASSISTED.exists():
+    st.error(f"File not found: {PATH_ASSISTED}")
+    st.error(f"Current directory: {Path.cwd()}")
+    st.error(
+        f"Files in temp_data: {list((ROOT / 'temp_data').glob('*')) if (ROOT / 'temp_data').exists() else 'temp_data folder not found'}")
+    st.stop()
 
 # Load data with progress indicator
 with st.spinner("Initializing NCAA-NBA Player Explorer..."):
-    df, df_complete, df_nba_players, df_career, df_bart, df_all_computed, df_2026_current = load_data()
+    data = load_data(data_version())
 
-# Create combined dataset for comparison/similarity tabs (NBA + 2026 current)
-if df_2026_current is not None and len(df_2026_current) > 0:
-    df_combined = pd.concat([df, df_2026_current], ignore_index=True)
-    # Remove duplicates, keeping NBA version if player is in both
-    df_combined = df_combined.drop_duplicates(
-        subset=['player_lower'], keep='first')
-else:
-    df_combined = df
-    df_2026_current = None  # Ensure it's explicitly None if empty
+# Tabs receive read-only handles; .frame is a shallow copy-on-write view
+df = data.nba.frame
+df_all_computed = data.all_college.frame if data.all_college is not None else None
+df_2026_current = data.current.frame if data.current is not None else None
 
 
 # ============================================================
 # TABS
 # ============================================================
-tab1, tab2, tab3 = st.tabs([
+tab1, tab2, tab3, tab4 = st.tabs([
     "🏀 Assisted & Rim Explorer",
     "📊 Player Profile & Compare Players",
-    "🎯 Player Similarity & Radar Charts"
+    "🎯 Player Similarity & Radar Charts",
+    "🗺️ Player Map"
 ])
 
 # ============================================================
@@ -408,6 +267,25 @@ with tab1:
         st.sidebar.warning("⚠️ 'From' year cannot be greater than 'To' year")
         max_year = min_year
 
+    # Season window: totals and metrics from part of each career only
+    season_window = st.sidebar.selectbox(
+        "Season Window",
+        list(WINDOWS),
+        index=0,
+        help="Recompute every stat from only these seasons of each player's college career "
+             "(seasons before 2010 are not in the data)"
+    )
+    season_range = None
+    if WINDOWS[season_window] and WINDOWS[season_window][0] == "calendar":
+        season_range = st.sidebar.slider(
+            "Seasons", min_value=2010, max_value=2026, value=(2010, 2026), step=1,
+            help="Only count shots from these college seasons")
+    recency_decay = st.sidebar.slider(
+        "Recency Decay", min_value=0.1, max_value=1.0, value=1.0, step=0.05,
+        help="Weight of each season relative to the one after it (1.0 = plain totals; "
+             "0.5 = every earlier season counts half as much). Attempts become weighted attempts"
+    )
+
     # Volume Filter
     # Footer info (after player type is defined)
     if show_non_nba_only:
@@ -423,7 +301,9 @@ with tab1:
         f"""
         ---
         *Data source: BartTorvik.com* | *Page by Dray Mottishaw (@draymottishaw on Twitter/X)*  
-        📊 **Dataset**: Complete career totals for {player_count_text} (2010-2026)
+        📊 **Dataset**: {"Complete career" if WINDOWS[season_window] is None
+                        else season_window} {"totals" if recency_decay == 1
+                        else f"recency-weighted totals (decay {recency_decay:.2f})"} for {player_count_text} (2010-2026)
         """)
 
     # Add performance controls
@@ -500,18 +380,21 @@ with tab1:
     sort_by = sort_mapping[sort_display_selected]
 
     # Get roles and years from the appropriate dataset
-    if show_non_nba_only and df_all_computed is not None:
-        # Filter to only non-NBA players (players in all_assisted but not in nba_complete)
-        nba_players_lower = set(df["player_lower"].str.lower().str.strip())
-        base_df = df_all_computed[~df_all_computed["player_lower"].str.lower(
-        ).str.strip().isin(nba_players_lower)].copy()
-    elif show_all_players and df_all_computed is not None:
-        base_df = df_all_computed
-    elif show_2026_only and df_2026_current is not None:
+    if show_non_nba_only and data.non_nba is not None:
+        # Only non-NBA players (players in all_assisted but not in nba_complete)
+        base_data = data.non_nba
+    elif show_all_players and data.all_college is not None:
+        base_data = data.all_college
+    elif show_2026_only and data.current is not None:
         # Show only 2026 current players
-        base_df = df_2026_current.copy()
+        base_data = data.current
     else:
-        base_df = df
+        base_data = data.nba
+    base_df = base_data.frame
+    if WINDOWS[season_window] is not None or recency_decay != 1:
+        # Recomputed every rerun (a prefix-sum difference), not kept per slider value
+        base_df = window_metrics(base_df, load_season_table(data_version()),
+                                 season_window, season_range, recency_decay)
 
     # Get unique roles and years from selected dataset
     roles = sorted(base_df["Role_final"].dropna().unique()
@@ -542,6 +425,13 @@ with tab1:
     else:
         selected_years = None  # None means don't filter by year
         st.sidebar.info("⚠️ No Year data for this dataset")
+
+    # Shot-profile archetype (precomputed clusters)
+    archetypes = load_archetypes(data_version())
+    selected_archetypes = st.sidebar.multiselect(
+        "Archetype", archetypes.labels, default=[],
+        help="Shot-diet / assisted% archetypes (leave empty for all players)",
+        key=f"archetypes_{player_type}")
     search_txt = st.sidebar.text_input(
         "Search Player", placeholder="Type player name...")
 
@@ -668,18 +558,9 @@ with tab1:
                 # Apply filters - use the appropriate dataset based on toggle
                 st.markdown("<hr style='border:0.5px solid #333;'>",
                             unsafe_allow_html=True)
-    if show_all_players and df_all_computed is not None:
-        base_df = df_all_computed
-    elif show_non_nba_only and df_all_computed is not None:
-        nba_players_lower = set(df["player_lower"].str.lower().str.strip())
-        base_df = df_all_computed[~df_all_computed["player_lower"].str.lower(
-        ).str.strip().isin(nba_players_lower)].copy()
-    elif show_2026_only and df_2026_current is not None:
-        # Show only 2026 current players
-        base_df = df_2026_current.copy()
-    else:
-        base_df = df
-    filt = base_df.copy()
+    # Apply filters — base_df is a copy-on-write view, so no defensive copy
+    filt = base_df
+    filt["Archetype"] = archetypes.labels_for(filt["player_lower"])
 
     # Role filtering - handle "Unknown" option and None (no data)
     if selected_roles is not None and selected_roles:
@@ -708,6 +589,9 @@ with tab1:
             year_mask = base_df["Year_final"].isin(selected_years)
         filt = filt[year_mask]
 
+    if selected_archetypes:
+        filt = filt[filt["Archetype"].isin(selected_archetypes)]
+
     # Draft year filtering (based on Last_Season = final college year)
     if 'Last_Season' in filt.columns and not show_2026_only:
         # Filter players whose final college season falls within the range
@@ -791,14 +675,18 @@ with tab1:
 
     # Role averages - use the same stat_cols as the filters for consistency
     # Safe role average calculation with error handling
-    role_avg_map = {}
-    for role, g in df.groupby("Role_final"):
-        for col in stat_cols:
-            if col in g.columns and not g[col].empty:
-                role_avg_map[(role, col)] = g[col].mean()
-            else:
-                # Default value if column missing or empty
-                role_avg_map[(role, col)] = 0.0
+    def build_role_avg_map(frame):
+        role_avg_map = {}
+        for role, g in frame.groupby("Role_final"):
+            for col in stat_cols:
+                if col in g.columns and not g[col].empty:
+                    role_avg_map[(role, col)] = g[col].mean()
+                else:
+                    # Default value if column missing or empty
+                    role_avg_map[(role, col)] = 0.0
+        return role_avg_map
+
+    role_avg_map = data.nba.view("role_avg_map", build_role_avg_map)
 
     # Only include columns that actually exist in the DataFrame
     available_pct_cols = [col for col in stat_cols if col in filt.columns]
@@ -806,7 +694,7 @@ with tab1:
     volume_cols = ["Total_Att", "RimAtt", "Mid_Att", "Three_Att"]
     other_cols = [col for col in available_pct_cols if col not in volume_cols]
     display_cols = ["Player", "Year_final",
-                    "Role_final"] + volume_cols + other_cols
+                    "Role_final", "Archetype"] + volume_cols + other_cols
 
     def highlight_row(row):
         role = row["Role_final"]
@@ -943,169 +831,117 @@ with tab2:
     from pages._Player_Compare import player_compare_app
     # Pass the combined df (NBA + 2026 current players)
     # Don't pass optional parameters to avoid Streamlit Cloud issues
-    player_compare_app(
-        df_merged=df_combined,
-        df_career=df_career,
-        df_bart=df_bart
-    )  # ============================================================
+    player_compare_app(data.combined,
+                       profile_store=load_profile_store(data_version()))  # ============================================================
 # TAB 3 — PLAYER SIMILARITY & RADAR CHARTS
 # ============================================================
 with tab3:
     import numpy as np
     import matplotlib.pyplot as plt
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.metrics.pairwise import cosine_similarity
 
     st.markdown("### Player Similarity & Radar Charts")
     st.markdown(
         "Find players with similar **shot diets** (where they get their shots), volume, height, and playing styles. Similarity includes shot location frequencies, volume, height, shooting efficiency, and shot creation style.")
 
-    # Core metrics that all players should have (excluding Height)
-    core_metrics = [
-        'Rim_Freq', 'Mid_Freq', 'Three_Freq', 'TwoPt_Freq',
-        'RimAtt', 'Mid_Att', 'Three_Att',
-        'Total_Assisted%', 'Mid_Assisted%', 'Three_Assisted%', 'TwoPt_Assisted%', 'NonDunk_Assisted%',
-        'Three_FG%', 'Total_Rim%'
-    ]
-
-    # Full metrics including Height (for 2026 players)
-    unique_metrics = core_metrics + ['Height']
+    # Built once per data version and shared across reruns
+    similarity_data = data.combined.derive(
+        "similarity", build_similarity_frame)
+    df_similarity = similarity_data.frame
+    similarity_index = similarity_data.index
 
-    # Filter players with complete data for similarity analysis (only require core metrics, Height optional)
-    df_similarity = df_combined[core_metrics +
-                                ['Player', 'Role_final']].dropna()
-
-    # Add Height column if it exists (will be NaN for NBA players)
-    if 'Height' in df_combined.columns:
-        df_similarity['Height'] = df_combined.loc[df_similarity.index, 'Height']
+    # Similarity weights (importance 2 = counts twice; applied at query time)
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("**🎯 Similarity Weights**")
+    with st.sidebar.expander("Feature group importance", expanded=False):
+        importance = {
+            group: st.slider(group, 0.0, 4.0, default, 0.25,
+                             key=f"sim_weight_{group}")
+            for group, default in DEFAULT_IMPORTANCE.items()
+        }
+    custom_weights = importance != DEFAULT_IMPORTANCE
+
+    # Candidate pool: NBA + 2026 by default, or the full D-I population
+    pool_options = ["NBA + 2026 players"]
+    if data.all_college is not None:
+        pool_options += ["All college players", "Non-NBA college players"]
+    comparison_pool = st.radio(
+        "Compare against:", pool_options, horizontal=True,
+        key="similarity_pool",
+        help="College pools search every D-I player in all_assisted.csv")
+    college_pool = comparison_pool != "NBA + 2026 players"
 
     # Player search
     search_player = st.selectbox(
         "Select a player to find similar players:",
-        [""] + sorted(df_similarity['Player'].unique()),
+        [""] + similarity_index.options,
         help="Choose a player to find others with similar playing styles",
         key="search_player_selector"
     )
 
     if search_player:
         # Check if selected player is from 2026
-        is_2026_player = (df_2026_current is not None and
-                          len(df_2026_current) > 0 and
-                          search_player in df_2026_current['Player'].values)
-
-        # If 2026 player, only compare against NBA players (who don't have Height)
-        if is_2026_player:
-            # Use metrics without Height for NBA comparison
-            comparison_metrics = [m for m in unique_metrics if m != 'Height']
-            df_comparison = df_similarity[df_similarity['Player'].isin(
-                df['Player'])]
-            # Filter to only include players with all required metrics
-            df_comparison = df_comparison[comparison_metrics +
-                                          ['Player', 'Role_final']].dropna()
+        is_2026_player = similarity_index.is_current(search_player)
+
+        # If 2026 player, only compare against NBA players (who don't have Height).
+        # The standardized feature matrix for each pool is cached per data version.
+        candidates = None
+        if college_pool:
+            college_data = data.all_college.derive(
+                "similarity", build_college_similarity_frame)
+            knn = get_similarity_index(college_data)
+            made_nba = nba_mask(college_data)
+            if comparison_pool == "Non-NBA college players":
+                candidates = ~made_nba
         else:
-            comparison_metrics = unique_metrics
-            df_comparison = df_similarity
+            knn = get_similarity_index(
+                similarity_data, nba_only=is_2026_player)
+        features = knn.features
+        comparison_metrics = features.metrics
 
-        # Calculate similarity with boosted weights for volume and height
-        player_data = df_similarity[df_similarity['Player']
-                                    == search_player][comparison_metrics].values
+        player_data = df_similarity.iloc[[similarity_index.position(
+            search_player)]][comparison_metrics].values
 
         if len(player_data) > 0:
-            # Get data and apply weights by duplicating columns
-            comparison_data = df_comparison[comparison_metrics].values
-
-            # Replace any NaN or inf values with 0
-            comparison_data = np.nan_to_num(
-                comparison_data, nan=0.0, posinf=0.0, neginf=0.0)
-            player_data = np.nan_to_num(
-                player_data, nan=0.0, posinf=0.0, neginf=0.0)
-
             # Check if we have valid data
-            if comparison_data.shape[0] == 0 or comparison_data.shape[1] == 0:
+            if len(features) == 0 or not comparison_metrics:
                 st.error("No valid comparison data available.")
             else:
-                # Create weighted data by duplicating volume and height columns
-                # Find indices for volume metrics
                 try:
-                    rimatt_idx = comparison_metrics.index('RimAtt')
-                    midatt_idx = comparison_metrics.index('Mid_Att')
-                    threeatt_idx = comparison_metrics.index('Three_Att')
-
-                    # Check if Height is in comparison metrics
-                    if 'Height' in comparison_metrics:
-                        height_idx = comparison_metrics.index('Height')
-                        weighted_comparison = np.column_stack([
-                            comparison_data,  # All original columns
-                            comparison_data[:, rimatt_idx],  # RimAtt duplicate
-                            # Mid_Att duplicate
-                            comparison_data[:, midatt_idx],
-                            # Three_Att duplicate
-                            comparison_data[:, threeatt_idx],
-                            comparison_data[:, height_idx]  # Height duplicate
-                        ])
-
-                        weighted_player = np.column_stack([
-                            player_data,
-                            player_data[:, rimatt_idx],
-                            player_data[:, midatt_idx],
-                            player_data[:, threeatt_idx],
-                            player_data[:, height_idx]
-                        ])
-                    else:
-                        # No height column, just duplicate volume
-                        weighted_comparison = np.column_stack([
-                            comparison_data,
-                            comparison_data[:, rimatt_idx],
-                            comparison_data[:, midatt_idx],
-                            comparison_data[:, threeatt_idx]
-                        ])
-
-                        weighted_player = np.column_stack([
-                            player_data,
-                            player_data[:, rimatt_idx],
-                            player_data[:, midatt_idx],
-                            player_data[:, threeatt_idx]
-                        ])
-
-                    # Check for constant columns and remove them
-                    col_std = np.std(weighted_comparison, axis=0)
-                    non_constant_cols = col_std > 1e-10
-
-                    if non_constant_cols.sum() == 0:
+                    if features.empty:
                         st.error(
                             "All features have zero variance. Cannot compute similarity.")
                     else:
-                        weighted_comparison = weighted_comparison[:,
-                                                                  non_constant_cols]
-                        weighted_player = weighted_player[:, non_constant_cols]
-
-                        # Normalize the weighted data
-                        scaler = StandardScaler()
-                        normalized_data = scaler.fit_transform(
-                            weighted_comparison)
-                        player_normalized = scaler.transform(weighted_player)
-
-                        # Calculate cosine similarity
-                        similarities = cosine_similarity(
-                            player_normalized, normalized_data)[0]
-
-                        # Create similarity dataframe
-                        similarity_df = df_comparison.copy()
-                        similarity_df['Similarity'] = similarities
-                        similarity_df = similarity_df.sort_values(
-                            'Similarity', ascending=False)
-
-                        # Remove the selected player from results
-                        similarity_df = similarity_df[similarity_df['Player']
-                                                      != search_player]
-
-                        comparison_text = " (vs NBA Players)" if is_2026_player else ""
+                        # Top 28 by cosine similarity, excluding the selected player:
+                        # read from the precomputed neighbour table when available
+                        neighbor_table = load_neighbor_table(data_version())
+                        if not (custom_weights or college_pool) and search_player in neighbor_table:
+                            top_ids, top_scores = neighbor_table.neighbors(
+                                search_player, k=28)
+                            top_players = df_similarity['Player'].to_numpy()[top_ids]
+                            top_roles = df_similarity['Role_final'].to_numpy()[top_ids]
+                        else:
+                            top_pos, top_scores = knn.top_k(
+                                player_data[0], k=28,
+                                exclude=features.positions.get(search_player, ()),
+                                candidates=candidates,
+                                weights=group_weights(importance))
+                            top_players = features.players[top_pos]
+                            top_roles = features.roles[top_pos]
+                        top_similar = pd.DataFrame({
+                            'Player': top_players,
+                            'Role_final': top_roles,
+                            'Similarity': top_scores,
+                        })
+
+                        if college_pool:
+                            comparison_text = f" ({comparison_pool})"
+                        else:
+                            comparison_text = " (vs NBA Players)" if is_2026_player else ""
                         st.markdown(
                             f"### 🎯 Shot Diet & FG% Similarity to **{search_player}**{comparison_text}:")
 
                         # Show top 28 similar players in 4 columns (7 rows each)
-                        top_similar = similarity_df.head(28)
-
+                        image_manifest = load_image_manifest(images_version())
                         col1, col2, col3, col4 = st.columns(4)
                         columns = [col1, col2, col3, col4]
 
@@ -1113,6 +949,10 @@ with tab3:
                             similarity_score = row['Similarity'] * 100
                             role = row['Role_final'] if pd.notna(
                                 row['Role_final']) else 'Unknown'
+                            # College pools: label whether the comparable made the NBA
+                            nba_label = ""
+                            if college_pool:
+                                nba_label = " · 🏀 NBA" if made_nba[top_pos[idx]] else " · College only"
 
                             # Create gradient color based on similarity rank
                             # High similarity = green, lower similarity = red
@@ -1136,12 +976,12 @@ with tab3:
                             # Distribute across 4 columns
                             target_col = columns[idx % 4]
                             with target_col:
-                                # Get player image
-                                player_img = get_player_image(row['Player'])
+                                # Cached thumbnail of the player image (None if missing)
+                                img_base64 = thumbnail_base64(
+                                    image_manifest.path_for(row['Player']))
 
-                                if player_img and os.path.exists(player_img):
+                                if img_base64:
                                     # Display with image embedded in colored card
-                                    img_base64 = get_base64_image(player_img)
                                     st.markdown(
                                         f"""
                                         <div style="background-color: {color}; padding: 8px; border-radius: 5px; margin-bottom: 5px; border: 1px solid rgba(255,255,255,0.1);">
@@ -1152,7 +992,7 @@ with tab3:
                                                     </td>
                                                     <td style="vertical-align: middle;">
                                                         <strong>{row['Player']}</strong> ({role})<br>
-                                                        <span style="color: #E8E8E8; font-size: 0.9em;">{similarity_score:.1f}% similar</span>
+                                                        <span style="color: #E8E8E8; font-size: 0.9em;">{similarity_score:.1f}% similar{nba_label}</span>
                                                     </td>
                                                 </tr>
                                             </table>
@@ -1166,12 +1006,34 @@ with tab3:
                                         f"""
                                         <div style="background-color: {color}; padding: 8px; border-radius: 5px; margin-bottom: 5px; border: 1px solid rgba(255,255,255,0.1);">
                                             <strong>{row['Player']}</strong> ({role})<br>
-                                            <span style="color: #E8E8E8; font-size: 0.9em;">{similarity_score:.1f}% similar</span>
+                                            <span style="color: #E8E8E8; font-size: 0.9em;">{similarity_score:.1f}% similar{nba_label}</span>
                                         </div>
                                         """,
                                         unsafe_allow_html=True
                                     )
 
+                        # Archetype peers: most central members of the player's cluster
+                        archetypes = load_archetypes(data_version())
+                        player_key = data.combined.index.row(search_player)[
+                            "player_lower"]
+                        archetype = archetypes.label_of(player_key)
+                        if archetype is not None:
+                            pool_data = {"All college players": None,
+                                         "Non-NBA college players": data.non_nba}.get(
+                                comparison_pool, data.combined)
+                            if pool_data is None:
+                                pool_keys = None  # every college player
+                            elif len(pool_data) == 0:
+                                pool_keys = frozenset()
+                            else:
+                                pool_keys = pool_data.view(
+                                    "player_lower_set", lambda f: frozenset(f["player_lower"]))
+                            peers = archetypes.peers(
+                                player_key, n=12, candidates=pool_keys)
+                            st.markdown(
+                                f"**🧬 Archetype: {archetype}** — most typical peers: "
+                                + (", ".join(peers["Player"]) or "none in this pool"))
+
                         st.markdown("---")
 
                 except Exception as e:
@@ -1185,8 +1047,8 @@ with tab3:
     with col_left:
         player1 = st.selectbox(
             "Select first player:",
-            [""] + (sorted(df_similarity['Player'].unique()) if not search_player else [search_player] +
-                    [p for p in sorted(df_similarity['Player'].unique()) if p != search_player]),
+            [""] + (similarity_index.options if not search_player else [search_player] +
+                    [p for p in similarity_index.options if p != search_player]),
             index=0 if not search_player else 0,
             help="Choose any player for comparison",
             key="player1_selector"
@@ -1195,11 +1057,16 @@ with tab3:
     with col_right:
         player2 = st.selectbox(
             "Select second player:",
-            [""] + sorted(df_similarity['Player'].unique()),
+            [""] + similarity_index.options,
             help="Choose any player to compare with the first player",
             key="player2_selector"
         )
 
+    radar_scale = st.radio(
+        "Radar scale:", ["Min–max", "Percentile rank", "Robust (5th–95th pct)"],
+        horizontal=True, key="radar_scale",
+        help="Percentile rank and robust scaling keep volume outliers from flattening the chart")
+
     if player1 and player2:
         col_chart, col_metrics = st.columns([1, 1])
 
@@ -1207,10 +1074,8 @@ with tab3:
             st.markdown("#### 📊 Radar Chart")
 
             # Get data for both players
-            player1_data = df_similarity[df_similarity['Player']
-                                         == player1].iloc[0]
-            player2_data = df_similarity[df_similarity['Player']
-                                         == player2].iloc[0]
+            player1_data = similarity_index.row(player1)
+            player2_data = similarity_index.row(player2)
 
             # Create unique metrics list for radar chart (no duplicates)
             unique_metrics = [
@@ -1225,26 +1090,13 @@ with tab3:
             values1_raw = [player1_data[metric] for metric in unique_metrics]
             values2_raw = [player2_data[metric] for metric in unique_metrics]
 
-            # Normalize values to 0-1 scale for radar chart display
-            # Use min-max normalization for each metric across all players
-            values1_normalized = []
-            values2_normalized = []
-
-            for i, metric in enumerate(unique_metrics):
-                metric_data = df_combined[metric].dropna()
-                min_val = metric_data.min()
-                max_val = metric_data.max()
-
-                # Avoid division by zero
-                if max_val - min_val > 0:
-                    v1_norm = (values1_raw[i] - min_val) / (max_val - min_val)
-                    v2_norm = (values2_raw[i] - min_val) / (max_val - min_val)
-                else:
-                    v1_norm = 0.5
-                    v2_norm = 0.5
-
-                values1_normalized.append(v1_norm)
-                values2_normalized.append(v2_norm)
+            # Normalize values to 0-1 scale for radar chart display, using
+            # bounds / sorted columns cached per data version
+            scaler = metric_scaler(data.combined, unique_metrics)
+            scale = {"Min–max": scaler.minmax, "Percentile rank": scaler.percentile,
+                     "Robust (5th–95th pct)": scaler.robust}[radar_scale]
+            values1_normalized = scale(values1_raw).tolist()
+            values2_normalized = scale(values2_raw).tolist()
 
             angles = [n / float(len(unique_metrics)) * 2 *
                       np.pi for n in range(len(unique_metrics))]
@@ -1327,3 +1179,57 @@ with tab3:
             comparison_df = pd.DataFrame(comparison_data)
             st.dataframe(comparison_df, use_container_width=True,
                          hide_index=True)
+
+# ============================================================
+# TAB 4 — PLAYER MAP
+# ============================================================
+with tab4:
+    import pydeck as pdk
+
+    st.markdown("### Player Map")
+    st.markdown(
+        "Every player placed by shot diet, volume, assisted% and efficiency (2D PCA of the "
+        "similarity features). Nearby players have similar profiles. Scroll to zoom, drag to pan.")
+
+    player_map = load_player_map(data_version())
+
+    col_color, col_sets = st.columns([1, 2])
+    with col_color:
+        color_by = st.radio("Color by:", ["Role", "Dataset", "Archetype"],
+                            horizontal=True, key="map_color_by")
+    with col_sets:
+        map_sets = st.multiselect(
+            "Show:", ["NBA", "2026", "College"], default=["NBA", "2026", "College"],
+            key="map_datasets")
+
+    points = player_map.points(color_by, load_archetypes(data_version()))
+    points = points[points["Dataset"].isin(map_sets)]
+
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=points[["Player", "Role", "Dataset", "Archetype", "x", "y", "color"]],
+        get_position=["x", "y"],
+        get_fill_color="color",
+        get_radius=2,
+        radius_units="pixels",
+        radius_min_pixels=2,
+        opacity=0.8,
+        pickable=True,
+    )
+    st.pydeck_chart(pdk.Deck(
+        layers=[layer],
+        views=[pdk.View(type="OrthographicView", controller=True)],
+        initial_view_state=pdk.ViewState(target=[0, 0, 0], zoom=0),
+        tooltip={"text": "{Player}\n{Role} · {Dataset}\n{Archetype}"},
+        map_style=None,
+    ), height=650)
+
+    # Legend
+    legend = points.drop_duplicates(color_by).sort_values(color_by)
+    st.markdown(" ".join(
+        f"<span style='background:rgb({r},{g},{b});padding:2px 8px;border-radius:4px;"
+        f"margin-right:4px;color:#111;font-size:12px;'>{label}</span>"
+        for label, (r, g, b) in zip(legend[color_by], legend["color"])),
+        unsafe_allow_html=True)
+    st.caption(f"{len(points):,} players · PCA explains "
+               f"{player_map.explained.sum():.0%} of feature variance")
@@ -2,9 +2,20 @@
 # utils.py — Metrics + Chart Utilities
 # ============================================================
 
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import matplotlib.ticker as mtick
+from matplotlib.figure import Figure
+
+# Bounded pool shared by every page for building + rasterizing chart grids.
+# Figures are created through the object-oriented API (no pyplot global
+# state), so independent figures can be drawn on separate threads.
+RENDER_WORKERS = 6
+_RENDER_POOL = ThreadPoolExecutor(
+    max_workers=RENDER_WORKERS, thread_name_prefix="chart-render")
 
 
 # ============================================================
@@ -112,8 +123,12 @@ def compute_metrics(df_assisted, df_career, df_bart):
 # ============================================================
 
 
-def grouped_player_role_year_overall_chart(title: str, player_val, role_val, year_val, overall_val):
-    """Render mini comparison bar chart with consistent dark styling. Fixed v2."""
+def grouped_player_role_year_overall_chart(title: str, player_val, role_val, year_val, overall_val,
+                                           bar_color=None):
+    """Render mini comparison bar chart with consistent dark styling. Fixed v2.
+
+    ``bar_color`` paints every bar one color (used by the side-by-side compare view).
+    """
     # Better None/NaN handling - convert None to NaN for consistent pd.notna() behavior
     def safe_convert(val):
         if val is None:
@@ -125,7 +140,8 @@ def grouped_player_role_year_overall_chart(title: str, player_val, role_val, yea
     year_val = safe_convert(year_val)
     overall_val = safe_convert(overall_val)
 
-    fig, ax = plt.subplots(figsize=(3.8, 2.2))
+    fig = Figure(figsize=(3.8, 2.2))
+    ax = fig.subplots()
 
     labels = ["Player", "Role", "Year", "Overall"]
     vals = [
@@ -138,7 +154,11 @@ def grouped_player_role_year_overall_chart(title: str, player_val, role_val, yea
     # purple-themed color palette (matches dark app)
     colors = ["#8A2BE2", "#6C63FF", "#9996FF", "#44D7B6"]
 
-    ax.bar(labels, vals, color=colors, edgecolor="white", linewidth=0.6)
+    if bar_color is not None:
+        ax.bar(labels, vals, color=bar_color,
+               edgecolor=bar_color, linewidth=0.6)
+    else:
+        ax.bar(labels, vals, color=colors, edgecolor="white", linewidth=0.6)
     ax.set_title(title, color="white", fontsize=9, pad=4)
     ax.set_ylim(0, 1)
     ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0))
@@ -147,5 +167,76 @@ def grouped_player_role_year_overall_chart(title: str, player_val, role_val, yea
         spine.set_color("#AAA")
     ax.set_facecolor("none")
     fig.patch.set_alpha(0)
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
+
+
+# ============================================================
+# GROUPED CHART — N Players per Zone
+# ============================================================
+# One color per compared player (up to 10)
+PLAYER_COLORS = ["#A16EFF", "#007CFF", "#FF4DD2", "#00FFE0", "#FFB347",
+                 "#6C63FF", "#44D7B6", "#FF6B6B", "#F9F871", "#9996FF"]
+
+
+def grouped_players_zone_chart(title: str, group_labels, player_names, values, role_vals, overall_vals):
+    """Grouped bars for N players across a zone's metrics, with role-average ticks.
+
+    ``values`` and ``role_vals`` are (players × groups) arrays; ``overall_vals``
+    has one entry per group and is drawn as a dashed reference line.
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=float))
+    role_vals = np.asarray(role_vals, dtype=float)
+    n_players, n_groups = values.shape
+
+    fig = Figure(figsize=(6.4, 2.8))
+    ax = fig.subplots()
+
+    width = 0.8 / max(n_players, 1)
+    x = np.arange(n_groups)
+    for i, name in enumerate(player_names):
+        xs = x - 0.4 + width * (i + 0.5)
+        color = PLAYER_COLORS[i % len(PLAYER_COLORS)]
+        ax.bar(xs, values[i], width=width * 0.92, color=color,
+               edgecolor=color, linewidth=0.6, label=name)
+        # Role average for this player's role, as a tick over the bar
+        ax.scatter(xs, role_vals[i], marker="_", s=90 * width * 4,
+                   color="white", linewidths=1.4, zorder=3)
+
+    for g, overall in enumerate(overall_vals):
+        if pd.notna(overall):
+            ax.hlines(overall, g - 0.45, g + 0.45, colors="#44D7B6",
+                      linestyles="dashed", linewidth=0.9)
+
+    ax.set_title(title, color="white", fontsize=9, pad=4)
+    ax.set_xticks(x)
+    ax.set_xticklabels(group_labels)
+    ax.set_ylim(0, 1)
+    ax.yaxis.set_major_formatter(mtick.PercentFormatter(1.0))
+    ax.tick_params(colors="white", labelsize=8)
+    for spine in ax.spines.values():
+        spine.set_color("#AAA")
+    ax.set_facecolor("none")
+    fig.patch.set_alpha(0)
+    legend = ax.legend(loc="upper left", bbox_to_anchor=(1.01, 1.0),
+                       frameon=False, fontsize=7)
+    for text in legend.get_texts():
+        text.set_color("white")
+    fig.tight_layout()
+    return fig
+
+
+# ============================================================
+# PARALLEL RENDERING — build + rasterize chart grids concurrently
+# ============================================================
+def render_figure_png(fig, dpi=200):
+    """Rasterize a figure to PNG bytes (same savefig options as st.pyplot)."""
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def render_charts_parallel(chart_builders):
+    """Run zero-arg figure builders on the render pool; return PNG bytes in input order."""
+    return list(_RENDER_POOL.map(
+        lambda build: render_figure_png(build()), chart_builders))